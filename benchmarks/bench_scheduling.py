@@ -0,0 +1,118 @@
+"""Latency benchmarks for the DSA schedulers on synthetic plans of growing size.
+
+    python benchmarks/bench_scheduling.py
+    python benchmarks/bench_scheduling.py --sizes 500 2000 --record benchmarks/results.jsonl
+
+Prints one table per case. With --record every measurement is appended as
+a JSON line (with the date and git revision) so latency can be tracked
+from one change to the next.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+
+from bench_common import ROOT, git_revision
+sys.path.insert(0, ROOT)
+
+from core.scheduling.batch import apply_batch
+from core.scheduling.entries import entries_from_rows
+from core.scheduling.interruptions import daterange_fmt, get_uid, reschedule_with_interruptions
+from core.scheduling.placement import find_placements
+from core.scheduling.sheet import delete_entry, rebuild_schedule_with_new
+
+SIZES = (500, 1000, 2000, 4000, 8000)
+START = datetime.date(2025, 1, 1)
+
+def synthetic_plan(n_topics, n_breaks, seed=0, start=START):
+    """Back-to-back DSA topics of 2-10 days with breaks sprinkled over the span"""
+    rnd = random.Random(seed)
+    rows = []
+    day = start
+    for i in range(n_topics):
+        days = rnd.randint(2, 10)
+        end = day + datetime.timedelta(days=days - 1)
+        rows.append({"Type": "DSA", "Topic": f"Topic {i}", "Days": days,
+                     "Date Range": daterange_fmt(day, end), "Notes": "", "UID": get_uid()})
+        day = end + datetime.timedelta(days=1)
+    span = (day - start).days
+    for j in range(n_breaks):
+        bstart = start + datetime.timedelta(days=rnd.randint(0, span))
+        days = rnd.randint(1, 6)
+        rows.append({"Type": "Break", "Topic": f"Break {j}", "Days": days,
+                     "Date Range": daterange_fmt(bstart, bstart + datetime.timedelta(days=days - 1)),
+                     "Notes": "", "UID": get_uid()})
+    return rows
+
+def time_call(fn, *args, repeat=3, **kwargs):
+    """Best wall time of `repeat` calls, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def _batch_ops(plan, n_ops=50, seed=0):
+    """A mix of inserts, breaks, deletes and note edits spread over the plan"""
+    rnd = random.Random(seed)
+    dsa = [e for e in plan if e.type == "DSA"]
+    ops = []
+    for i in range(n_ops):
+        kind = ("insert", "break", "delete", "note")[i % 4]
+        if kind in ("delete", "note"):
+            ops.append({"op": kind, "uid": dsa[rnd.randrange(len(dsa))].uid, "note": "bench"})
+        else:
+            day = datetime.date.fromordinal(plan[rnd.randrange(len(plan))].start)
+            ops.append({"op": kind, "topic": f"{kind} {i}", "start": day,
+                        "end": day + datetime.timedelta(days=rnd.randint(0, 4))})
+    # Deleting the same row twice is fine, editing a deleted one is not
+    deleted = {op["uid"] for op in ops if op["op"] == "delete"}
+    return [op for op in ops if op["op"] != "note" or op["uid"] not in deleted]
+
+def cases(n_topics):
+    """(case name, zero-argument callable) pairs for one plan size"""
+    plan = entries_from_rows(synthetic_plan(n_topics, n_topics // 10))
+    settled = reschedule_with_interruptions(plan)
+    sheet = rebuild_schedule_with_new(plan, today=START)
+    last_topic = max(i for i, e in enumerate(sheet) if e.type == "DSA")
+    ops = _batch_ops(settled)
+    return [
+        ("interruptions: reschedule", lambda: reschedule_with_interruptions(settled)),
+        ("interruptions: batch of 50 ops", lambda: apply_batch(settled, ops)),
+        ("placement: top 5 slots for 7 days", lambda: find_placements(settled, 7, k=5, not_before=START)),
+        ("sheet: full rebuild", lambda: rebuild_schedule_with_new(sheet, today=START)),
+        ("sheet: delete last topic", lambda: delete_entry(sheet, last_topic, today=START)),
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DSA schedulers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of topics to plan")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--record", metavar="JSONL", help="append the measurements to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for n_topics in args.sizes:
+        for name, fn in cases(n_topics):
+            results.setdefault(name, []).append((n_topics, time_call(fn, repeat=args.repeat)))
+
+    for name, rows in results.items():
+        print(f"\n{name}")
+        print(f"{'topics':>8} {'total ms':>10} {'us/topic':>10}")
+        for n_topics, seconds in rows:
+            print(f"{n_topics:>8} {seconds * 1000:>10.1f} {seconds / n_topics * 1e6:>10.1f}")
+
+    if args.record:
+        stamp = datetime.datetime.now().isoformat(timespec="seconds")
+        revision = git_revision()
+        with open(args.record, "a", encoding="utf-8") as f:
+            for name, rows in results.items():
+                for n_topics, seconds in rows:
+                    f.write(json.dumps({"when": stamp, "rev": revision, "case": name,
+                                        "topics": n_topics, "ms": round(seconds * 1000, 3)}) + "\n")
+
+if __name__ == "__main__":
+    main()
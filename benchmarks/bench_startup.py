@@ -0,0 +1,114 @@
+"""Startup cost of the app: cold imports and time to first render.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 5 --record benchmarks/startup.jsonl
+
+Every measurement runs in a fresh interpreter (best of --repeat), inside an
+empty temporary directory so no data file is read or written:
+
+- import: importing a module on top of an already imported streamlit, i.e.
+  what a page costs on its first visit (core.router imports pages lazily)
+- render: one AppTest run of daily_app.py, or of a single page's draw(),
+  with streamlit and AppTest already imported
+"""
+import os
+import sys
+import json
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+from bench_common import ROOT, git_revision
+sys.path.insert(0, ROOT)
+
+from core.router import PAGES
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+import streamlit
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+RENDER_APP_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file({script!r}).run(timeout=60)
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+RENDER_PAGE_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+
+def page(root, module):
+    import sys
+    sys.path.insert(0, root)
+    from core import data_handler, router
+    data_handler.init_session_state()
+    router.load_page(module).draw()
+
+start = time.perf_counter()
+at = AppTest.from_function(page, kwargs={{"root": {root!r}, "module": {module!r}}}).run(timeout=60)
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+def fresh_seconds(snippet, repeat):
+    """Best of `repeat` fresh interpreters running snippet, which prints seconds"""
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as scratch:
+        # A file rather than -c: AppTest.from_function reads the function's source
+        script = os.path.join(scratch, "startup_case.py")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(snippet)
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, script], cwd=scratch, capture_output=True,
+                                 text=True, check=True).stdout
+            best = min(best, float(out.strip().splitlines()[-1]))
+    return best
+
+def cases(with_pages):
+    """(case name, snippet) pairs"""
+    found = [("import: core.data_handler", IMPORT_SNIPPET.format(root=ROOT, module="core.data_handler")),
+             ("import: core.router", IMPORT_SNIPPET.format(root=ROOT, module="core.router")),
+             ("import: pandas", IMPORT_SNIPPET.format(root=ROOT, module="pandas")),
+             ("render: daily_app.py", RENDER_APP_SNIPPET.format(
+                 root=ROOT, script=os.path.join(ROOT, "daily_app.py")))]
+    if with_pages:
+        for _, _, module in PAGES:
+            found.append((f"import: {module}", IMPORT_SNIPPET.format(root=ROOT, module=module)))
+            found.append((f"render: {module}", RENDER_PAGE_SNIPPET.format(root=ROOT, module=module)))
+    return found
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app startup")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-pages", action="store_true", help="skip the per-page measurements")
+    parser.add_argument("--record", metavar="JSONL", help="append the measurements to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'case':<40} {'ms':>8}")
+    for name, snippet in cases(not args.no_pages):
+        seconds = fresh_seconds(snippet, args.repeat)
+        results.append((name, seconds))
+        print(f"{name:<40} {seconds * 1000:>8.1f}")
+
+    if args.record:
+        stamp = datetime.datetime.now().isoformat(timespec="seconds")
+        revision = git_revision()
+        with open(args.record, "a", encoding="utf-8") as f:
+            for name, seconds in results:
+                f.write(json.dumps({"when": stamp, "rev": revision, "case": name,
+                                    "ms": round(seconds * 1000, 3)}) + "\n")
+
+if __name__ == "__main__":
+    main()
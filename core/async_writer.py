@@ -0,0 +1,99 @@
+import atexit
+import threading
+import time
+
+class CoalescingWriter:
+    """Single background thread that batches queued changes into one flush.
+
+    Changes are submitted under a (collection, path) key. A newer change for
+    the same key, or for a parent path, replaces the queued one, so a burst of
+    saves within `window` seconds reaches disk as one flush_fn(records) call.
+    """
+
+    def __init__(self, flush_fn, window=0.25):
+        self.flush_fn = flush_fn
+        self.window = window
+        self._pending = {}
+        self._submitted = 0
+        self._flushed = 0
+        self._error = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="data-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, key, record):
+        """Queue record; key is (collection, path tuple) or None for a full snapshot"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._queue(key, record)
+            self._submitted += 1
+            self._cond.notify_all()
+
+    def _queue(self, key, record):
+        if key is None:
+            self._pending.clear()
+        else:
+            collection, path = key
+            for queued in list(self._pending):
+                if queued is None:
+                    continue
+                if queued[0] == collection and queued[1][:len(path)] == path:
+                    del self._pending[queued]
+        self._pending[key] = record
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+            # Let the rest of the burst arrive before writing
+            if not self._closed:
+                time.sleep(self.window)
+            with self._cond:
+                batch = dict(self._pending)
+                upto = self._submitted
+                self._pending = {}
+            try:
+                self.flush_fn(list(batch.values()))
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    # Put the batch back under anything queued since, and retry
+                    newer, self._pending = self._pending, batch
+                    for key, record in newer.items():
+                        self._queue(key, record)
+                    self._cond.notify_all()
+                    if self._closed:
+                        return
+                continue
+            with self._cond:
+                self._flushed = upto
+                self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until everything submitted so far is on disk; False on timeout.
+
+        Raises the last flush error if one happened; the failed changes stay
+        queued and are retried.
+        """
+        with self._cond:
+            target = self._submitted
+            done = self._cond.wait_for(lambda: self._flushed >= target or self._error is not None, timeout)
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+        return done
+
+    def close(self):
+        """Flush what is queued and stop the thread"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
@@ -1,85 +1,83 @@
 import calendar
-import datetime
+import functools
 import streamlit as st
+from core.data_handler import data_version
+from core.classroom_index import get_index
 
-def render_activity_calendar(record_dict, year, month, title):
-    """Render tick/cross calendar for boolean record dict"""
-    month_cal = calendar.monthcalendar(year, month)
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    tick = "<span style='color:green;font-size:22px;'>&#10003;</span>"
-    cross = "<span style='color:red;font-size:22px;'>&#10007;</span>"
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+TICK = "<span style='color:green;font-size:22px;'>&#10003;</span>"
+CROSS = "<span style='color:red;font-size:22px;'>&#10007;</span>"
+TABLE_HEAD = (
+    "<table style='width:100%;text-align:center;font-size:16px;'><tr>"
+    + "".join(f"<th style='padding:2px 8px 2px 8px;'>{d}</th>" for d in DAYS)
+    + "</tr>"
+)
 
-    table_html = f"<table style='width:100%;text-align:center;font-size:16px;'><tr>"
-    for d in days:
-        table_html += f"<th style='padding:2px 8px 2px 8px;'>{d}</th>"
-    table_html += "</tr>"
+def month_days(year, month):
+    """ISO date strings for every day of the month, in order"""
+    return [f"{year:04d}-{month:02d}-{day:02d}" for day in range(1, calendar.monthrange(year, month)[1] + 1)]
 
-    for week in month_cal:
-        table_html += "<tr>"
+@functools.lru_cache(maxsize=48)
+def month_skeleton(year, month):
+    """Static HTML pieces of a month table plus the slot index of each day's mark"""
+    parts = [TABLE_HEAD]
+    slots = []
+    for week in calendar.monthcalendar(year, month):
+        parts.append("<tr>")
         for day in week:
             if day == 0:
-                table_html += "<td></td>"
+                parts.append("<td></td>")
             else:
-                day_date = datetime.date(year, month, day).isoformat()
-                mark = tick if record_dict.get(day_date, False) else cross
-                table_html += f"<td style='padding:7px'>{day}<br>{mark}</td>"
-        table_html += "</tr>"
+                parts.append(f"<td style='padding:7px'>{day}<br>")
+                slots.append(len(parts))
+                parts.append("")
+                parts.append("</td>")
+        parts.append("</tr>")
+    parts.append("</table>")
+    return tuple(parts), tuple(slots)
 
-    table_html += "</table>"
-    st.markdown(f"##### {title}")
-    st.markdown(table_html, unsafe_allow_html=True)
+def calendar_html(status, year, month):
+    """Tick/cross month table from a per-day status vector (index 0 = day 1)"""
+    parts, slots = month_skeleton(year, month)
+    parts = list(parts)
+    for slot, done in zip(slots, status):
+        parts[slot] = TICK if done else CROSS
+    return "".join(parts)
 
-def render_classroom_calendar(completed_tasks_dict, year, month, title):
-    """Render calendar showing checkbox if any subject has completed task"""
-    month_cal = calendar.monthcalendar(year, month)
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    tick = "<span style='color:green;font-size:22px;'>&#10003;</span>"
-    cross = "<span style='color:red;font-size:22px;'>&#10007;</span>"
+# ---- per-day status vectors ----
+def record_status(records, year, month):
+    """Status of a boolean {ISO date: bool} record (dict, HabitLog or month partition)"""
+    if hasattr(records, "month_bits"):
+        bits = records.month_bits(year, month)
+        return [bool((bits >> i) & 1) for i in range(calendar.monthrange(year, month)[1])]
+    if hasattr(records, "month"):
+        records = records.month(f"{year:04d}-{month:02d}")
+    return [bool(records.get(day, False)) for day in month_days(year, month)]
 
-    table_html = f"<table style='width:100%;text-align:center;font-size:16px;'><tr>"
-    for d in days:
-        table_html += f"<th style='padding:2px 8px 2px 8px;'>{d}</th>"
-    table_html += "</tr>"
+def classroom_status(completed_tasks_dict, year, month):
+    """True on days where any subject has a completed task (one index lookup per day)"""
+    index = get_index()
+    return [any(index.get(day, {}).values()) for day in month_days(year, month)]
 
-    for week in month_cal:
-        table_html += "<tr>"
-        for day in week:
-            if day == 0:
-                table_html += "<td></td>"
-            else:
-                day_date = datetime.date(year, month, day).isoformat()
-                has_any = any(completed_tasks_dict[subj].get(day_date) for subj in completed_tasks_dict)
-                mark = tick if has_any else cross
-                table_html += f"<td style='padding:7px'>{day}<br>{mark}</td>"
-        table_html += "</tr>"
+STATUS_BUILDERS = {
+    "completed_classroom_tasks": classroom_status,
+}
 
-    table_html += "</table>"
-    st.markdown(f"##### {title}")
-    st.markdown(table_html, unsafe_allow_html=True)
-
-def render_water_calendar(water_main_checklist_dict, year, month, title):
-    """Render calendar for water consumption status (3+ checklist marks)"""
-    month_cal = calendar.monthcalendar(year, month)
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    tick = "<span style='color:green;font-size:22px;'>&#10003;</span>"
-    cross = "<span style='color:red;font-size:22px;'>&#10007;</span>"
-
-    table_html = f"<table style='width:100%;text-align:center;font-size:16px;'><tr>"
-    for d in days:
-        table_html += f"<th style='padding:2px 8px 2px 8px;'>{d}</th>"
-    table_html += "</tr>"
-
-    for week in month_cal:
-        table_html += "<tr>"
-        for day in week:
-            if day == 0:
-                table_html += "<td></td>"
-            else:
-                day_date = datetime.date(year, month, day).isoformat()
-                mark = tick if water_main_checklist_dict.get(day_date, False) else cross
-                table_html += f"<td style='padding:7px'>{day}<br>{mark}</td>"
-        table_html += "</tr>"
+def render_calendar(collection, year, month, title):
+    """Render the tick/cross calendar of a session_state collection.
 
-    table_html += "</table>"
+    The HTML is memoized per session by (collection, year, month) together
+    with the collection's data version, so an unchanged calendar is not
+    rebuilt on rerun.
+    """
+    version = data_version(collection)
+    cache = st.session_state.setdefault("_calendar_html", {})
+    cached = cache.get((collection, year, month))
+    if cached is not None and cached[0] == version:
+        table_html = cached[1]
+    else:
+        status_fn = STATUS_BUILDERS.get(collection, record_status)
+        table_html = calendar_html(status_fn(st.session_state[collection], year, month), year, month)
+        cache[(collection, year, month)] = (version, table_html)
     st.markdown(f"##### {title}")
     st.markdown(table_html, unsafe_allow_html=True)
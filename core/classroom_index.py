@@ -0,0 +1,41 @@
+import streamlit as st
+from core import data_handler
+
+# Inverted view of completed_classroom_tasks: {day: {subject: [topics]}}.
+# The topic lists are the same objects as in completed_classroom_tasks, so the
+# index only changes when a (subject, day) pair appears for the first time.
+
+def build_index(completed_tasks_dict):
+    """Full day -> {subject: topics} index, used once per session"""
+    index = {}
+    for subject, days in completed_tasks_dict.items():
+        for day, topics in days.items():
+            index.setdefault(day, {})[subject] = topics
+    return index
+
+def get_index():
+    """Session index, rebuilt only if completed_classroom_tasks was replaced"""
+    completed = st.session_state.completed_classroom_tasks
+    cached = st.session_state.get("_classroom_index")
+    if cached is None or cached[0] is not completed:
+        cached = (completed, build_index(completed))
+        st.session_state["_classroom_index"] = cached
+    return cached[1]
+
+def record_completion(subject, day, task):
+    """Mark task done on day for subject, keeping the index in step"""
+    # The session's own copy first, so the index is built over it
+    completed = data_handler.editable("completed_classroom_tasks")
+    index = get_index()
+    days = completed.setdefault(subject, {})
+    if day not in days:
+        days[day] = []
+        index.setdefault(day, {})[subject] = days[day]
+    days[day].append(task)
+
+def topics_on(day):
+    """{subject: [topics]} completed on day"""
+    return {subject: topics for subject, topics in get_index().get(day, {}).items() if topics}
+
+def has_completion(day):
+    return any(get_index().get(day, {}).values())
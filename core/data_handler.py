@@ -1,6 +1,71 @@
 import os
-import json
+import copy
 import streamlit as st
+from core.storage import make_backend, read_json, DATE_KEYED_COLLECTIONS, BITMAP_HABITS
+from core.partitions import FilePartitionStore, MonthPartitionedRecords
+from core.habit_log import HabitLog
+from core import stats
+from core.async_writer import CoalescingWriter
+from core.shared_store import SharedStore
+from core.journal import make_record
+from core.scheduling.entries import ScheduleEntry, entries_from_rows, get_uid, rows_from_entries
+
+# Storage backend, see core.storage:
+#   "snapshot" rewrites data.json on every save
+#   "journal"  appends only the changed key to data.journal and folds it
+#              back into data.json periodically
+#   "sqlite"   date-indexed tables in data.db (core.migrate converts json)
+#   "sharded"  one data/<collection>.json per collection, each rewritten
+#              only when that collection is saved (core.shard_store)
+STORAGE_MODE = "sharded"
+# Opt-in: hand saves to a background thread that merges bursts into one
+# flush per FLUSH_WINDOW seconds instead of writing on the script thread
+ASYNC_WRITES = False
+FLUSH_WINDOW = 0.25
+# Keep date-keyed history in per-month partitions: only the current month is
+# read at startup, older months load on demand (see core.partitions).
+# BITMAP_HABITS are exempt: a whole year of a boolean habit is a 46-byte bitset.
+PARTITION_HISTORY = True
+# daily_app saved its DSA plan here before it moved into the "dsa_schedule"
+# collection; imported once, in place of DEFAULT_DSA_SCHEDULE
+LEGACY_DSA_FILE = "dsa_schedule.json"
+# Each DSA page keeps its own plan: daily_app pins topics to their dates,
+# the DSA Sheet page packs them around breaks (core.scheduling.engine)
+PLAN_COLLECTIONS = ("dsa_sheet", "dsa_schedule")
+
+_backend = None
+_history = None
+_writer = None
+# Writes issued by save_data(), and reruns whose flush_dirty() found nothing
+# to write; for checking that viewing a page writes nothing
+write_counts = {"performed": 0, "skipped": 0}
+
+# daily_app's starting plan, stored on a fresh install (when neither the
+# collection nor LEGACY_DSA_FILE exists); UIDs are given out then
+DEFAULT_DSA_SCHEDULE = [
+    {"Type": "DSA", "Topic": "LinkedList", "Days": 9, "Date Range": "27/07/25 – 04/08/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Recursion", "Days": 6, "Date Range": "05/08/25 – 10/08/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Bit Manipulation (Part 1)", "Days": 3, "Date Range": "11/08/25 – 13/08/25", "Notes": ""},
+    {"Type": "Break", "Topic": "CAT-1", "Days": 12, "Date Range": "14/08/25 – 25/08/25", "Notes": "🧠 Exams"},
+    {"Type": "DSA", "Topic": "Bit Manipulation (Part 2)", "Days": 2, "Date Range": "26/08/25 – 27/08/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Stack & Queues", "Days": 7, "Date Range": "28/08/25 – 03/09/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Sliding Window", "Days": 6, "Date Range": "04/09/25 – 09/09/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Heaps", "Days": 5, "Date Range": "10/09/25 – 14/09/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Greedy Algorithms", "Days": 7, "Date Range": "15/09/25 – 24/09/25", "Notes": ""},
+    {"Type": "Break", "Topic": "Gravitas", "Days": 5, "Date Range": "25/09/25 – 29/09/25", "Notes": "🎓 Event"},
+    {"Type": "DSA", "Topic": "Binary Trees (Part 1)", "Days": 2, "Date Range": "30/09/25 – 01/10/25", "Notes": ""},
+    {"Type": "Break", "Topic": "CAT-2", "Days": 12, "Date Range": "02/10/25 – 13/10/25", "Notes": "🧠 Exams"},
+    {"Type": "DSA", "Topic": "Binary Trees (Part 2)", "Days": 10, "Date Range": "14/10/25 – 16/10/25, 19/10/25 – 25/10/25", "Notes": ""},
+    {"Type": "Break", "Topic": "Diwali Travel 1", "Days": 2, "Date Range": "17/10/25 – 18/10/25", "Notes": "🪔 Festival"},
+    {"Type": "Break", "Topic": "Diwali Travel 2", "Days": 2, "Date Range": "26/10/25 – 27/10/25", "Notes": "🛫 Travel"},
+    {"Type": "DSA", "Topic": "Binary Search Trees", "Days": 3, "Date Range": "28/10/25 – 30/10/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Graphs (Part 1)", "Days": 5, "Date Range": "31/10/25 – 05/11/25", "Notes": ""},
+    {"Type": "Break", "Topic": "FAT & Labs + FAT", "Days": 31, "Date Range": "06/11/25 – 06/12/25", "Notes": "📚 Exams"},
+    {"Type": "DSA", "Topic": "Graphs (Part 2)", "Days": 9, "Date Range": "07/12/25 – 15/12/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Dynamic Programming", "Days": 16, "Date Range": "16/12/25 – 31/12/25", "Notes": ""},
+    {"Type": "DSA", "Topic": "Tries", "Days": 5, "Date Range": "01/01/26 – 05/01/26", "Notes": ""},
+    {"Type": "DSA", "Topic": "Strings", "Days": 7, "Date Range": "06/01/26 – 12/01/26", "Notes": ""},
+]
 
 # Default structure to use when data.json is not created yet
 DEFAULT_DATA = {
@@ -34,32 +99,252 @@ DEFAULT_DATA = {
         "Folder 4": [],
     },
     "dsa_sheet": [{} for _ in range(18)],
+    "dsa_schedule": DEFAULT_DSA_SCHEDULE,
     "important_dates": []
 }
 
+COLLECTIONS = list(DEFAULT_DATA)
+
+def get_backend():
+    """Storage backend for the configured STORAGE_MODE"""
+    global _backend
+    if _backend is None:
+        _backend = make_backend(STORAGE_MODE)
+    return _backend
+
+def get_history_store():
+    """Where partitioned history lives: the backend itself if it can serve months"""
+    global _history
+    if _history is None:
+        backend = get_backend()
+        _history = backend if hasattr(backend, "load_month") else FilePartitionStore()
+    return _history
+
+def _partitioned(name):
+    return PARTITION_HISTORY and name in DATE_KEYED_COLLECTIONS and name not in BITMAP_HABITS
+
+def _row_store():
+    """True when the backend keeps one row per day (sqlite) rather than JSON documents"""
+    return hasattr(get_backend(), "load_month")
+
+def _stored_value(value):
+    """Turn in-memory structures back into what the backend stores"""
+    if isinstance(value, HabitLog):
+        return value.to_dict() if _row_store() else value.to_json()
+    if isinstance(value, MonthPartitionedRecords):
+        return value.to_dict()
+    if isinstance(value, list) and value and isinstance(value[0], ScheduleEntry):
+        return rows_from_entries(value)
+    return value
+
+def _load_habit_log(name, stored):
+    """HabitLog from the backend value, folding in any older per-month files"""
+    log = HabitLog.from_stored(stored)
+    if _row_store():
+        return log
+    history = FilePartitionStore()
+    months = history.months(name)
+    if months:
+        for month in months:
+            for day, done in history.load_month(name, month).items():
+                log[day] = bool(done)
+        get_backend().write([{"c": name, "p": [], "v": log.to_json()}])
+        history.write([{"c": name, "p": [], "v": {}}])
+    return log
+
+def _move_to_partitions(name, legacy):
+    """History saved before partitioning sits in the main store, move it out"""
+    get_history_store().write([{"c": name, "p": [day], "v": value} for day, value in legacy.items()])
+    get_backend().write([{"c": name, "p": [], "v": {}}])
+
 def load_data():
-    """Load data.json or return default if not found"""
-    if os.path.exists("data.json"):
-        with open("data.json", "r") as f:
-            return json.load(f)
-    return DEFAULT_DATA.copy()
-
-def save_data():
-    """Save session_state into data.json safely"""
-    with open("data.json", "w") as f:
-        json.dump({
-            "classroom_tasks": st.session_state.classroom_tasks,
-            "completed_classroom_tasks": st.session_state.completed_classroom_tasks,
-            "app_updates": st.session_state.app_updates,
-            "app_ideas": st.session_state.app_ideas,
-            "duolingo_records": st.session_state.duolingo_records,
-            "morning_exercise_records": st.session_state.morning_exercise_records,
-            "jawline_records": st.session_state.jawline_records,
-            "dairy_records": st.session_state.dairy_records,
-            "water_counts": st.session_state.water_counts,
-            "water_checklists": st.session_state.water_checklists,
-            "water_main_checklist": st.session_state.water_main_checklist,
-            "passwords": st.session_state.passwords,
-            "dsa_sheet": st.session_state.dsa_sheet,
-            "important_dates": st.session_state.important_dates,
-        }, f)
+    """Load stored data, filling in defaults for anything not saved yet"""
+    backend = get_backend()
+    if hasattr(backend, "lazy_habits"):
+        backend.lazy_habits = [name for name in DATE_KEYED_COLLECTIONS if _partitioned(name)]
+    data = backend.load(DEFAULT_DATA)
+    for name, value in DEFAULT_DATA.items():
+        if name not in data:
+            data[name] = copy.deepcopy(value)
+    for name in DATE_KEYED_COLLECTIONS:
+        if name in BITMAP_HABITS:
+            data[name] = _load_habit_log(name, data[name])
+        elif _partitioned(name):
+            if data[name] and get_history_store() is not backend:
+                _move_to_partitions(name, data[name])
+            data[name] = MonthPartitionedRecords(name, get_history_store())
+    # The default rows carry no UIDs, so a saved plan (even an empty one) never equals them
+    if data["dsa_schedule"] == DEFAULT_DSA_SCHEDULE:
+        data["dsa_schedule"] = _seed_plan()
+    # Parse the DSA plans' date ranges once; rows are rebuilt only when saving
+    for name in PLAN_COLLECTIONS:
+        data[name] = entries_from_rows(data[name])
+    return data
+
+def _seed_plan():
+    """First dsa_schedule: daily_app's old LEGACY_DSA_FILE if there is one, else the defaults"""
+    if os.path.exists(LEGACY_DSA_FILE):
+        rows = rows_from_entries(entries_from_rows(read_json(LEGACY_DSA_FILE, [])))
+    else:
+        rows = DEFAULT_DSA_SCHEDULE
+    rows = [dict(row, UID=row.get("UID") or get_uid()) for row in rows]
+    get_backend().write([{"c": "dsa_schedule", "p": [], "v": rows}])
+    return rows
+
+@st.cache_resource(show_spinner=False)
+def get_shared_store():
+    """The one SharedStore of this process, loaded on first use"""
+    return SharedStore(load_data())
+
+def init_session_state():
+    """Point session_state at the shared data; call on every rerun.
+
+    Sessions start out sharing the store's objects, read-only: nothing is
+    copied when a session binds them. Changing one in place goes through
+    editable(), which copies it for this session first. Later calls rebind
+    what another session saved since, and bump data_version() for it so
+    render caches built from the old object are dropped.
+    """
+    seen = st.session_state.setdefault("_shared_versions", {})
+    owned = st.session_state.setdefault("_owned", set())
+    refreshed = []
+    for name, (version, value) in get_shared_store().changed_since(seen).items():
+        if name in seen:
+            refreshed.append(name)
+        st.session_state[name] = value
+        owned.discard(name)
+        seen[name] = version
+    if refreshed:
+        _on_refresh(refreshed)
+
+def editable(collection):
+    """This session's own copy of collection, to change in place before saving it.
+
+    The first call after binding (or after a save handed the copy to the
+    shared store) copies the shared object; later calls return the copy.
+    Replacing the collection with a new object needs no call.
+    """
+    owned = st.session_state.setdefault("_owned", set())
+    if collection not in owned:
+        st.session_state[collection] = copy.deepcopy(st.session_state[collection])
+        owned.add(collection)
+    return st.session_state[collection]
+
+def _on_refresh(collections):
+    """Drop this session's caches of collections another session saved"""
+    _bump_versions(collections)
+    for name in collections:
+        stats.on_save(name)
+    if "completed_classroom_tasks" in collections:
+        # The index follows the dict by identity, in-place edits elsewhere miss it
+        st.session_state.pop("_classroom_index", None)
+
+def _publish(collections):
+    """Hand this session's collections to the shared store for the other sessions.
+
+    The objects themselves are handed over: from here on this session reads
+    them like any other, and its next in-place edit copies them again.
+    """
+    store = get_shared_store()
+    seen = st.session_state.setdefault("_shared_versions", {})
+    owned = st.session_state.setdefault("_owned", set())
+    for name in collections:
+        if name in st.session_state:
+            seen[name] = store.publish(name, st.session_state[name])
+            owned.discard(name)
+
+def _session_data():
+    """Collections that belong in a full snapshot (partitioned history is stored apart)"""
+    return {name: _stored_value(st.session_state[name]) for name in COLLECTIONS if not _partitioned(name)}
+
+def _flush(records):
+    """Send each record to the store that owns its collection"""
+    history = get_history_store() if PARTITION_HISTORY else None
+    if history is None or history is get_backend():
+        get_backend().write(records)
+        return
+    history.write([r for r in records if "c" in r and _partitioned(r["c"])])
+    get_backend().write([r for r in records if "c" not in r or not _partitioned(r["c"])])
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        _writer = CoalescingWriter(_flush, window=FLUSH_WINDOW)
+    return _writer
+
+def wait_for_writes(timeout=None):
+    """Block until queued async saves are durable; True if nothing is pending"""
+    if _writer is None:
+        return True
+    return _writer.wait(timeout)
+
+def _write(key, record):
+    if ASYNC_WRITES:
+        # Copy now, the script thread keeps mutating session_state
+        _get_writer().submit(key, copy.deepcopy(record))
+    else:
+        _flush([record])
+
+def compact():
+    """Write a full snapshot of session_state (folds any journal into it)"""
+    _write(None, {"snapshot": _session_data()})
+
+def data_version(collection):
+    """Counter bumped on every save of collection in this session, for render caches"""
+    return st.session_state.get("_data_versions", {}).get(collection, 0)
+
+def _bump_versions(collections):
+    versions = st.session_state.setdefault("_data_versions", {})
+    for name in collections:
+        versions[name] = versions.get(name, 0) + 1
+
+def save_data(collection=None, key=None):
+    """Save session_state through the storage backend.
+
+    collection/key name what changed (key may be a tuple path such as
+    (subject, date)) so the backend only writes that change; with no
+    collection the whole snapshot is rewritten. Other sessions see the
+    change once it is written; with ASYNC_WRITES the write is only queued
+    (see wait_for_writes()), so they may see it before it is on disk.
+    """
+    write_counts["performed"] += 1
+    collections = COLLECTIONS if collection is None else [collection]
+    _bump_versions(collections)
+    if collection is None:
+        compact()
+    else:
+        _write_change(collection, key)
+    _publish(collections)
+    stats.on_save(collection, key)
+
+def _write_change(collection, key):
+    """Write collection, or only its key, through the backend"""
+    if collection in BITMAP_HABITS and not _row_store():
+        # The whole bitmap is smaller than most single-day journal lines
+        key = None
+    record = make_record(collection, key, st.session_state[collection])
+    if "v" in record:
+        record["v"] = _stored_value(record["v"])
+    _write((collection, tuple(record["p"])), record)
+    if isinstance(st.session_state[collection], MonthPartitionedRecords):
+        st.session_state[collection].mark_saved(record["p"][0] if record["p"] else None)
+    if get_backend().needs_compaction():
+        compact()
+
+def mark_dirty(collection, key=None):
+    """Note that collection (or just its key) changed; flush_dirty() saves it"""
+    st.session_state.setdefault("_dirty", {}).setdefault(collection, set()).add(key)
+
+def flush_dirty():
+    """Save what mark_dirty() noted since the last flush; run at the end of every rerun"""
+    dirty = st.session_state.get("_dirty")
+    if not dirty:
+        write_counts["skipped"] += 1
+        return
+    st.session_state["_dirty"] = {}
+    for collection, keys in dirty.items():
+        if None in keys:
+            save_data(collection)
+        else:
+            for key in keys:
+                save_data(collection, key)
@@ -0,0 +1,158 @@
+import base64
+import datetime
+import calendar
+from collections.abc import MutableMapping
+
+def _as_date(day):
+    if isinstance(day, datetime.datetime):
+        return day.date()
+    if isinstance(day, datetime.date):
+        return day
+    return datetime.date.fromisoformat(day)
+
+# 366 bits rounded up to whole bytes
+YEAR_BYTES = 46
+
+class HabitLog(MutableMapping):
+    """Boolean daily habit stored as one bitset (a Python int) per year.
+
+    Bit n of years[y] is day n of year y (Jan 1 = bit 0). Reads and writes are
+    O(1), month/year totals are popcounts and streaks are computed with a
+    handful of big-int operations instead of walking the days. It still
+    behaves like the old {ISO date: bool} dict for the pages (get, [], in).
+    """
+
+    def __init__(self, years=None):
+        self.years = dict(years or {})
+
+    # ---- conversion ----
+    @classmethod
+    def from_dict(cls, records):
+        """Import the legacy {ISO date: bool} format"""
+        log = cls()
+        for day, done in records.items():
+            if done:
+                log[day] = True
+        return log
+
+    @classmethod
+    def from_stored(cls, value):
+        """Build from what a backend returned: bitmap JSON, legacy dict or a mix"""
+        if isinstance(value, HabitLog):
+            return value
+        value = dict(value or {})
+        bitmap = value.pop("bitmap", {})
+        log = cls({
+            int(year): int.from_bytes(base64.b64decode(encoded), "little")
+            for year, encoded in bitmap.items()
+        })
+        # Per-day entries written before the bitmap format apply on top
+        for day, done in value.items():
+            log[day] = bool(done)
+        return log
+
+    def to_json(self):
+        """{"bitmap": {"2025": base64 bitset}} - about 64 characters per year"""
+        return {"bitmap": {
+            str(year): base64.b64encode(bits.to_bytes(YEAR_BYTES, "little")).decode("ascii")
+            for year, bits in sorted(self.years.items()) if bits
+        }}
+
+    def to_dict(self):
+        """Legacy {ISO date: True} dict of completed days"""
+        return {day: True for day in self}
+
+    # ---- mapping interface ----
+    def __getitem__(self, day):
+        d = _as_date(day)
+        if (self.years.get(d.year, 0) >> (d.timetuple().tm_yday - 1)) & 1:
+            return True
+        raise KeyError(day)
+
+    def get(self, day, default=None):
+        d = _as_date(day)
+        if (self.years.get(d.year, 0) >> (d.timetuple().tm_yday - 1)) & 1:
+            return True
+        return default
+
+    def __setitem__(self, day, done):
+        d = _as_date(day)
+        bit = 1 << (d.timetuple().tm_yday - 1)
+        bits = self.years.get(d.year, 0)
+        self.years[d.year] = (bits | bit) if done else (bits & ~bit)
+
+    def __delitem__(self, day):
+        self[day] = False
+
+    def __contains__(self, day):
+        try:
+            return self.get(day, False)
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        for year in sorted(self.years):
+            bits = self.years[year]
+            jan1 = datetime.date(year, 1, 1).toordinal()
+            while bits:
+                low = bits & -bits
+                yield datetime.date.fromordinal(jan1 + low.bit_length() - 1).isoformat()
+                bits ^= low
+
+    def __len__(self):
+        return sum(bits.bit_count() for bits in self.years.values())
+
+    # ---- aggregates ----
+    def month_bits(self, year, month):
+        """Bitset of one month, bit 0 = day 1"""
+        first = datetime.date(year, month, 1).timetuple().tm_yday - 1
+        days = calendar.monthrange(year, month)[1]
+        return (self.years.get(year, 0) >> first) & ((1 << days) - 1)
+
+    def month_total(self, year, month):
+        return self.month_bits(year, month).bit_count()
+
+    def _span(self):
+        """All years as one bitset starting at Jan 1 of the first year"""
+        if not self.years:
+            return 0, 0
+        first = min(self.years)
+        base = datetime.date(first, 1, 1).toordinal()
+        bits = 0
+        for year, year_bits in self.years.items():
+            bits |= year_bits << (datetime.date(year, 1, 1).toordinal() - base)
+        return base, bits
+
+    def count_between(self, start, end):
+        """Completed days between two dates inclusive"""
+        base, bits = self._span()
+        lo = max(_as_date(start).toordinal() - base, 0)
+        hi = _as_date(end).toordinal() - base
+        if hi < lo:
+            return 0
+        return ((bits >> lo) & ((1 << (hi - lo + 1)) - 1)).bit_count()
+
+    def current_streak(self, today=None):
+        """Consecutive completed days ending today (or yesterday if today is open)"""
+        today = _as_date(today or datetime.date.today())
+        base, bits = self._span()
+        idx = today.toordinal() - base
+        if idx < 0 or not bits:
+            return 0
+        if not (bits >> idx) & 1:
+            idx -= 1
+        if idx < 0:
+            return 0
+        window = bits & ((1 << (idx + 1)) - 1)
+        gaps = ~window & ((1 << (idx + 1)) - 1)
+        return idx + 1 - gaps.bit_length()
+
+    def longest_streak(self):
+        """Longest run of consecutive completed days"""
+        _, bits = self._span()
+        longest = 0
+        # Each step drops the last day of every run, so the loop runs once per day of the longest run
+        while bits:
+            bits &= bits >> 1
+            longest += 1
+        return longest
@@ -0,0 +1,88 @@
+import datetime
+import numpy as np
+import pandas as pd
+import streamlit as st
+from core.data_handler import data_version
+from core.classroom_index import get_index
+from core.habit_log import YEAR_BYTES
+from core.stats import HABIT_LABELS
+
+TRACKERS = dict(HABIT_LABELS, water_counts="Water Count", completed_classroom_tasks="Classroom Studies")
+# Value that paints a cell at full intensity
+FULL_SCALE = {"water_counts": 4, "completed_classroom_tasks": 3}
+PALETTE = np.array(["#ebedf0", "#c6e48b", "#7bc96f", "#239a3b", "#196127"])
+
+def _habit_column(log, days):
+    """0/1 array for every day of `days` straight from the HabitLog bitsets"""
+    out = np.zeros(len(days), dtype=np.int8)
+    for year in days.year.unique():
+        bits = np.unpackbits(
+            np.frombuffer(log.years.get(year, 0).to_bytes(YEAR_BYTES, "little"), dtype=np.uint8),
+            bitorder="little",
+        )
+        mask = days.year == year
+        out[mask] = bits[days[mask].dayofyear - 1]
+    return out
+
+def _dict_column(records, days):
+    """Values of a {ISO date: number} record aligned on days (0 when missing)"""
+    values = {}
+    months = sorted(set(days.strftime("%Y-%m")))
+    for month in months:
+        chunk = records.month(month) if hasattr(records, "month") else records
+        values.update((day, value) for day, value in chunk.items() if day[:7] == month)
+    series = pd.Series(values, dtype="float64")
+    series.index = pd.to_datetime(series.index)
+    return series.reindex(days, fill_value=0).to_numpy()
+
+def build_frame(start, end):
+    """Day-indexed frame (one column per tracker) for start..end inclusive"""
+    days = pd.date_range(start, end, freq="D")
+    state = st.session_state
+    columns = {name: _habit_column(state[name], days) for name in HABIT_LABELS}
+    columns["water_counts"] = _dict_column(state.water_counts, days)
+    index = get_index()
+    columns["completed_classroom_tasks"] = _dict_column(
+        {day: sum(len(t) for t in subjects.values()) for day, subjects in index.items()}, days)
+    return pd.DataFrame(columns, index=days)
+
+def get_frame(start, end):
+    """build_frame cached in the session until one of the trackers is saved again"""
+    key = (start, end, tuple(data_version(name) for name in TRACKERS))
+    cached = st.session_state.get("_heatmap_frame")
+    if cached is None or cached[0] != key:
+        cached = (key, build_frame(start, end))
+        st.session_state["_heatmap_frame"] = cached
+    return cached[1]
+
+def heatmap_html(frame):
+    """All trackers as week-column heatmaps, computed column-wise and joined once"""
+    lead = frame.index[0].weekday()
+    total = lead + len(frame)
+    weeks = -(-total // 7)
+    parts = ["<table style='border-collapse:separate;border-spacing:2px;font-size:12px;'>"]
+    for name, label in TRACKERS.items():
+        values = frame[name].to_numpy(dtype="float64")
+        levels = np.ceil(np.clip(values / FULL_SCALE.get(name, 1), 0, 1) * 4).astype(int)
+        padded = np.full(weeks * 7, -1)
+        padded[lead:total] = levels
+        grid = padded.reshape(weeks, 7).T
+        colors = np.where(grid >= 0, PALETTE[np.clip(grid, 0, 4)], "transparent")
+        parts.append(f"<tr><td colspan='{weeks + 1}' style='padding-top:8px;font-weight:bold;'>{label}</td></tr>")
+        for weekday, row in enumerate(colors):
+            parts.append(f"<tr><td style='color:#888;padding-right:4px;'>{'MTWTFSS'[weekday]}</td>")
+            parts.append("".join(
+                f"<td style='width:11px;height:11px;background:{c};border-radius:2px;'></td>" for c in row))
+            parts.append("</tr>")
+    parts.append("</table>")
+    return "".join(parts)
+
+def render_year_heatmap(year):
+    """Year-at-a-glance heatmap of every tracker"""
+    start = datetime.date(year, 1, 1)
+    end = min(datetime.date(year, 12, 31), datetime.date.today())
+    frame = get_frame(start, end)
+    st.markdown(f"##### {year} at a glance")
+    st.markdown(heatmap_html(frame), unsafe_allow_html=True)
+    totals = frame.astype(bool).sum()
+    st.caption(" | ".join(f"{label}: {int(totals[name])} days" for name, label in TRACKERS.items()))
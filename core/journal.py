@@ -0,0 +1,102 @@
+import os
+import json
+from collections.abc import Mapping
+
+# Append-only change log that sits next to the data.json snapshot
+JOURNAL_FILE = "data.journal"
+# Fold the log back into the snapshot after this many records
+COMPACT_AFTER = 500
+
+_record_count = 0
+
+def _as_path(key):
+    """Normalise a key (None, str or tuple) into a list path"""
+    if key is None:
+        return []
+    if isinstance(key, (tuple, list)):
+        return list(key)
+    return [key]
+
+def _lookup(container, path):
+    """Walk path inside container, return (found, value)"""
+    node = container
+    for part in path:
+        if isinstance(node, Mapping) and part in node:
+            node = node[part]
+        else:
+            return False, None
+    return True, node
+
+def make_record(collection, key, container):
+    """Build a journal record for one change of container at key"""
+    path = _as_path(key)
+    found, value = _lookup(container, path)
+    if found:
+        return {"c": collection, "p": path, "v": value}
+    return {"c": collection, "p": path, "d": 1}
+
+def append_records(records):
+    """Append records to the journal file"""
+    global _record_count
+    if not records:
+        return
+    with open(JOURNAL_FILE, "a") as f:
+        f.write("".join(json.dumps(rec) + "\n" for rec in records))
+    _record_count += len(records)
+
+def apply_record(data, record):
+    """Apply one journal record onto data in place"""
+    path = record["p"]
+    if not path:
+        data[record["c"]] = record["v"]
+        return
+    node = data.setdefault(record["c"], {})
+    for part in path[:-1]:
+        node = node.setdefault(part, {})
+    if record.get("d"):
+        node.pop(path[-1], None)
+    else:
+        node[path[-1]] = record["v"]
+
+def replay(data):
+    """Apply every journaled change onto the snapshot data in place"""
+    global _record_count
+    _record_count = 0
+    if not os.path.exists(JOURNAL_FILE):
+        return data
+    with open(JOURNAL_FILE, "rb") as f:
+        lines = f.readlines()
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # A torn line from an interrupted append, skip it
+            continue
+        apply_record(data, record)
+        _record_count += 1
+    if lines and not lines[-1].endswith(b"\n"):
+        _repair_tail(lines[-1])
+    return data
+
+def _repair_tail(last):
+    """End the journal on a line break so the next append starts a fresh line"""
+    try:
+        json.loads(last)
+    except ValueError:
+        # Torn mid-record: cut it off
+        os.truncate(JOURNAL_FILE, os.path.getsize(JOURNAL_FILE) - len(last))
+        return
+    # Torn just before its newline: the record itself is whole
+    with open(JOURNAL_FILE, "ab") as f:
+        f.write(b"\n")
+
+def needs_compaction():
+    """True once the journal has grown past COMPACT_AFTER records"""
+    return _record_count >= COMPACT_AFTER
+
+def truncate():
+    """Drop the journal once its changes are part of the snapshot"""
+    global _record_count
+    if os.path.exists(JOURNAL_FILE):
+        os.remove(JOURNAL_FILE)
+    _record_count = 0
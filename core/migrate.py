@@ -0,0 +1,56 @@
+"""Convert JSON app data into the SQLite store and back.
+
+    python -m core.migrate                      # data/ or data.json + dsa_schedule.json -> data.db
+    python -m core.migrate --export backup.json # data.db -> json
+"""
+import os
+import argparse
+from core.storage import DATE_KEYED_COLLECTIONS, BITMAP_HABITS, JournalBackend, read_json, write_json_atomic
+from core.partitions import FilePartitionStore
+from core.habit_log import HabitLog
+from core.sqlite_store import SqliteBackend, DB_FILE
+from core.shard_store import ShardedBackend, SHARD_DIR
+
+DSA_SCHEDULE_COLLECTION = "dsa_schedule"
+
+def import_json(db_path=DB_FILE, data_path="data.json", dsa_path="dsa_schedule.json"):
+    """Load data/ shards (or data.json with its journal), history/ partitions and dsa_schedule.json into db_path"""
+    if os.path.isdir(SHARD_DIR):
+        data = ShardedBackend().load({})
+    else:
+        data = JournalBackend(data_path).load({})
+    history = FilePartitionStore()
+    for name in DATE_KEYED_COLLECTIONS:
+        for month in history.months(name):
+            data.setdefault(name, {}).update(history.load_month(name, month))
+    for name in BITMAP_HABITS:
+        if name in data:
+            # SQLite keeps one row per completed day
+            data[name] = HabitLog.from_stored(data[name]).to_dict()
+    if dsa_path and os.path.exists(dsa_path) and not data.get(DSA_SCHEDULE_COLLECTION):
+        data[DSA_SCHEDULE_COLLECTION] = read_json(dsa_path, [])
+    SqliteBackend(db_path).write([{"snapshot": data}])
+    return data
+
+def export_json(db_path=DB_FILE, out_path="data.json"):
+    """Dump everything in db_path to a single JSON file"""
+    data = SqliteBackend(db_path).load({})
+    write_json_atomic(out_path, data)
+    return data
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate daily app data between JSON and SQLite")
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--dsa", default="dsa_schedule.json")
+    parser.add_argument("--export", metavar="OUT_JSON", help="export the database instead of importing")
+    args = parser.parse_args(argv)
+    if args.export:
+        data = export_json(args.db, args.export)
+        print(f"Exported {len(data)} collections to {args.export}")
+    else:
+        data = import_json(args.db, args.data, args.dsa)
+        print(f"Imported {len(data)} collections into {args.db}")
+
+if __name__ == "__main__":
+    main()
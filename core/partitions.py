@@ -0,0 +1,209 @@
+import os
+import copy
+import datetime
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from core.storage import read_json, write_json_atomic
+
+HISTORY_DIR = "history"
+# How many non-current months stay in memory per collection
+COLD_MONTHS_RESIDENT = 3
+# Collections whose per-month (sum, count) is kept in history/<collection>/_totals.json,
+# so stats need no month files at startup
+SUMMED_COLLECTIONS = ("water_counts",)
+TOTALS_FILE = "_totals.json"
+
+def month_of(day):
+    """'2025-07-24' -> '2025-07'"""
+    return day[:7]
+
+def month_total(days):
+    """(sum, count) of a month's values that read as integers"""
+    values = []
+    for value in days.values():
+        try:
+            values.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return sum(values), len(values)
+
+class FilePartitionStore:
+    """One small JSON file per collection per month: history/<collection>/<YYYY-MM>.json"""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = root
+
+    def _path(self, collection, month):
+        return os.path.join(self.root, collection, f"{month}.json")
+
+    def months(self, collection):
+        folder = os.path.join(self.root, collection)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-5] for name in os.listdir(folder)
+                      if name.endswith(".json") and name != TOTALS_FILE)
+
+    def month_totals(self, collection):
+        """{month: [sum, count]} for every stored month of collection"""
+        path = os.path.join(self.root, collection, TOTALS_FILE)
+        stored = read_json(path, {})
+        totals = {}
+        for month in self.months(collection):
+            totals[month] = stored.get(month) or list(month_total(self.load_month(collection, month)))
+        if totals != stored and collection in SUMMED_COLLECTIONS:
+            # Months written before totals were kept are counted once
+            write_json_atomic(path, totals)
+        return totals
+
+    def load_month(self, collection, month):
+        return read_json(self._path(collection, month), {})
+
+    def _save_month(self, collection, month, days):
+        path = self._path(collection, month)
+        if not days:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_json_atomic(path, days)
+
+    def write(self, records):
+        """Apply per-day records ({"c", "p": [day], "v"/"d"}); p == [] replaces the collection"""
+        touched = {}
+        for record in records:
+            collection, path = record["c"], record["p"]
+            if not path:
+                for month in self.months(collection):
+                    touched[(collection, month)] = {}
+                for day, value in (record.get("v") or {}).items():
+                    touched.setdefault((collection, month_of(day)), {})[day] = value
+                continue
+            day = path[0]
+            key = (collection, month_of(day))
+            if key not in touched:
+                touched[key] = self.load_month(*key)
+            if record.get("d"):
+                touched[key].pop(day, None)
+            else:
+                touched[key][day] = record["v"]
+        for (collection, month), days in touched.items():
+            self._save_month(collection, month, days)
+        for collection in {collection for collection, _ in touched if collection in SUMMED_COLLECTIONS}:
+            self._save_totals(collection, {month: days for (name, month), days in touched.items() if name == collection})
+
+    def _save_totals(self, collection, months):
+        path = os.path.join(self.root, collection, TOTALS_FILE)
+        totals = read_json(path, {})
+        for month, days in months.items():
+            if days:
+                totals[month] = list(month_total(days))
+            else:
+                totals.pop(month, None)
+        if totals:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_json_atomic(path, totals)
+        elif os.path.exists(path):
+            os.remove(path)
+
+class MonthPartitionedRecords(MutableMapping):
+    """{ISO date: value} mapping that keeps only some months in memory.
+
+    The current month is loaded eagerly and pinned; any other month is read
+    from the store the first time one of its days is touched and kept in a
+    small LRU of COLD_MONTHS_RESIDENT months. A month edited since its last
+    save is never evicted; save_data() calls mark_saved() once it is written.
+    Sessions share one instance read-only, and reading loads and evicts
+    months, so the month cache is behind a lock.
+    """
+
+    def __init__(self, collection, store, today=None):
+        self.collection = collection
+        self.store = store
+        self.hot_month = month_of((today or datetime.date.today()).isoformat())
+        self._known = set(store.months(collection))
+        self._hot = store.load_month(collection, self.hot_month)
+        self._cold = OrderedDict()
+        self._unsaved = set()
+        self._lock = threading.Lock()
+
+    def month(self, month):
+        """The resident {day: value} dict for 'YYYY-MM', loading it if needed"""
+        if month == self.hot_month:
+            return self._hot
+        with self._lock:
+            if month in self._cold:
+                self._cold.move_to_end(month)
+                return self._cold[month]
+            days = self.store.load_month(self.collection, month) if month in self._known else {}
+            self._cold[month] = days
+            evictable = [old for old in self._cold if old not in self._unsaved]
+            for old in evictable[:len(self._cold) - COLD_MONTHS_RESIDENT]:
+                del self._cold[old]
+            return days
+
+    def _resident(self):
+        """[(month, days)] held in memory, hot month first"""
+        with self._lock:
+            return [(self.hot_month, self._hot), *self._cold.items()]
+
+    def __deepcopy__(self, memo):
+        """Private copies of the resident months, over the same store"""
+        clone = copy.copy(self)
+        with self._lock:
+            clone._known = set(self._known)
+            clone._hot = copy.deepcopy(self._hot, memo)
+            clone._cold = copy.deepcopy(self._cold, memo)
+            clone._unsaved = set(self._unsaved)
+        clone._lock = threading.Lock()
+        return clone
+
+    def mark_saved(self, day=None):
+        """The edits to day's month (every month when day is None) are in the store"""
+        with self._lock:
+            if day is None:
+                self._unsaved.clear()
+            else:
+                self._unsaved.discard(month_of(day))
+
+    def month_totals(self):
+        """{month: (sum, count)}, from the store's totals except for months held in memory"""
+        totals = {month: tuple(total) for month, total in self.store.month_totals(self.collection).items()}
+        for month, days in self._resident():
+            if days:
+                totals[month] = month_total(days)
+            else:
+                totals.pop(month, None)
+        return totals
+
+    def months(self):
+        """Every month that has data, oldest first"""
+        known = set(self._known)
+        known.update(month for month, days in self._resident() if days)
+        return sorted(known)
+
+    def __getitem__(self, day):
+        return self.month(month_of(day))[day]
+
+    def __setitem__(self, day, value):
+        self.month(month_of(day))[day] = value
+        self._known.add(month_of(day))
+        self._unsaved.add(month_of(day))
+
+    def __delitem__(self, day):
+        del self.month(month_of(day))[day]
+        self._unsaved.add(month_of(day))
+
+    def __contains__(self, day):
+        return isinstance(day, str) and day in self.month(month_of(day))
+
+    def __iter__(self):
+        for month in self.months():
+            yield from list(self.month(month))
+
+    def __len__(self):
+        return sum(len(self.month(month)) for month in self.months())
+
+    def to_dict(self):
+        """Materialise every month (for export/snapshots)"""
+        return {day: self[day] for day in self}
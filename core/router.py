@@ -0,0 +1,47 @@
+import importlib
+import streamlit as st
+from core import data_handler
+
+# Sidebar pages as (title, icon, module). A module is imported only when its
+# page is first opened, so pandas and the other heavy helpers a page needs
+# are not paid for at startup.
+PAGES = (
+    ("Home", "🏠", "pages.home"),
+    ("Top Reminders", "🔔", "pages.top_reminders"),
+    ("Afternoon Schedule", "🕑", "pages.afternoon_schedule"),
+    ("Classroom Studies", "📚", "pages.classroom_studies"),
+    ("DSA Sheet Scheduling", "🧠", "pages.dsa_sheet"),
+    ("Important Dates", "📅", "pages.important_dates"),
+    ("Dairy Entry", "📖", "pages.dairy"),
+    ("Mind & Body Routine", "🧘", "pages.mind_body"),
+    ("Balanced Diet", "🥗", "pages.balanced_diet"),
+    ("Time Reminder", "⏰", "pages.time_reminder"),
+    ("Stored Data", "🗃️", "pages.stored_data"),
+    ("Password Vault", "🔒", "pages.passwords"),
+    ("Details and Portfolio", "📁", "pages.details_portfolio"),
+    ("App Update", "🔄", "pages.app_update"),
+)
+
+def load_page(module_name):
+    """The page module, imported on first use"""
+    return importlib.import_module(module_name)
+
+def _lazy_page(module_name):
+    def draw():
+        load_page(module_name).draw()
+    return draw
+
+def run(default_page, default_title, default_icon=None):
+    """Draw the page picked in the sidebar, then save the collections it marked dirty.
+
+    default_page is the landing page callable.
+    """
+    pages = [st.Page(default_page, title=default_title, icon=default_icon, default=True)]
+    for title, icon, module_name in PAGES:
+        pages.append(st.Page(_lazy_page(module_name), title=title, icon=icon,
+                             url_path=module_name.rsplit(".", 1)[-1]))
+    try:
+        st.navigation(pages).run()
+    finally:
+        # Also when the page ends the run early with st.rerun() / st.stop()
+        data_handler.flush_dirty()
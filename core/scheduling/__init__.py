@@ -0,0 +1 @@
+# Streamlit-free scheduling logic shared by the DSA pages
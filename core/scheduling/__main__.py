@@ -0,0 +1,85 @@
+"""Reschedule a DSA plan offline, without Streamlit.
+
+    python -m core.scheduling data/dsa_schedule.json -o rescheduled.json
+    python -m core.scheduling data/dsa_sheet.json --today 2025-08-01
+    python -m core.scheduling data.json --collection dsa_schedule
+    python -m core.scheduling dsa_schedule.json --batch semester.csv
+
+A plan is a JSON list of rows (a data/<collection>.json shard or the old
+dsa_schedule.json) or a data.json object holding every collection. Each
+plan collection has its own engine: dsa_sheet is packed around breaks by
+the sheet engine, dsa_schedule is pinned by the interruptions engine. The
+rescheduled rows go to stdout unless -o is given; timing goes to stderr.
+"""
+import os
+import argparse
+import datetime
+import json
+import sys
+import time
+from core.scheduling.batch import apply_batch, read_ops
+from core.scheduling.entries import entries_from_rows, rows_from_entries
+from core.scheduling.interruptions import reschedule_with_interruptions
+from core.scheduling.sheet import rebuild_schedule_with_new
+
+# The engine each plan collection is laid out by
+ENGINES = {"dsa_sheet": "sheet", "dsa_schedule": "interruptions"}
+
+def load_plan(path, collection=None):
+    """(rows, collection) of a plan file.
+
+    collection picks the plan in a data.json (default dsa_sheet); a list
+    file is the collection its name says, dsa_schedule when it says neither.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        collection = collection or "dsa_sheet"
+        return data.get(collection, []), collection
+    name = os.path.splitext(os.path.basename(path))[0]
+    return data, collection or (name if name in ENGINES else "dsa_schedule")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.scheduling",
+                                     description="Reschedule a DSA plan JSON file offline")
+    parser.add_argument("plan", help="a data/<collection>.json shard, data.json or any JSON list of rows")
+    parser.add_argument("--collection", choices=list(ENGINES),
+                        help="plan to read from data.json (default: dsa_sheet); "
+                             "overrides the collection a list file's name implies")
+    parser.add_argument("--engine", choices=["interruptions", "sheet"],
+                        help="scheduler to run (default: the collection's, "
+                             "sheet for dsa_sheet and interruptions for dsa_schedule)")
+    parser.add_argument("--batch", metavar="OPS_FILE", help="CSV/JSON ops to apply first (interruptions engine)")
+    parser.add_argument("--today", type=datetime.date.fromisoformat, help="YYYY-MM-DD, for plans without breaks")
+    parser.add_argument("-o", "--output", help="write the rescheduled rows here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rows, collection = load_plan(args.plan, args.collection)
+    engine = args.engine or ENGINES[collection]
+    entries = entries_from_rows(rows)
+    ops = None
+    if args.batch:
+        if engine != "interruptions":
+            parser.error("--batch needs the interruptions engine")
+        with open(args.batch, encoding="utf-8-sig") as f:
+            ops = read_ops(f.read(), "json" if args.batch.lower().endswith(".json") else "csv")
+
+    start = time.perf_counter()
+    if engine == "sheet":
+        result = rebuild_schedule_with_new(entries, today=args.today)
+    elif ops is not None:
+        result = apply_batch(entries, ops)
+    else:
+        result = reschedule_with_interruptions(entries)
+    elapsed = time.perf_counter() - start
+
+    text = json.dumps(rows_from_entries(result), ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    print(f"{engine}: {len(entries)} rows -> {len(result)} rows in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
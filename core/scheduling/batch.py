@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+import datetime
+from core.scheduling.entries import ScheduleEntry, get_uid, parse_date
+from core.scheduling.interruptions import reschedule_with_interruptions
+
+# Batch operations, as dicts keyed by "op":
+#   {"op": "insert", "topic", "start", "end", "note"}   new study topic
+#   {"op": "break", "topic", "start", "end", "note"}    new fixed break
+#   {"op": "delete", "uid"}
+#   {"op": "note", "uid", "note"}
+# Dates may be date objects, "dd/mm/yy" or ISO "YYYY-MM-DD" strings.
+OPS = ("insert", "break", "delete", "note")
+
+def _op_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    text = str(value or "").strip()
+    ordinal = parse_date(text)
+    if ordinal:
+        return datetime.date.fromordinal(ordinal)
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Bad date {value!r}, use dd/mm/yy or YYYY-MM-DD")
+
+def _dated(n, op):
+    topic = str(op.get("topic") or "").strip()
+    if not topic:
+        raise ValueError(f"Op {n}: {op['op']} needs a topic")
+    try:
+        start = _op_date(op.get("start"))
+        end = _op_date(op.get("end") or op.get("start"))
+    except ValueError as e:
+        raise ValueError(f"Op {n} ({topic}): {e}")
+    if start > end:
+        raise ValueError(f"Op {n} ({topic}): start is after end")
+    return topic, start, end, str(op.get("note") or "").strip()
+
+def apply_batch(entries, ops):
+    """Apply a list of operations as one transaction with a single reschedule.
+
+    Every op is validated before anything changes; a bad op raises
+    ValueError and the plan is left as it was. Returns the rescheduled
+    ScheduleEntry list.
+    """
+    entries = [ScheduleEntry.from_row(e) for e in entries]
+    uids = {entry.uid for entry in entries}
+    deletes = set()
+    notes = {}
+    new_topics = []
+    breaks = []
+    for n, op in enumerate(ops, 1):
+        kind = op.get("op")
+        if kind not in OPS:
+            raise ValueError(f"Op {n}: unknown op {kind!r}")
+        if kind in ("delete", "note") and "uid" not in op:
+            raise ValueError(f"Op {n}: {kind} needs a uid")
+        if kind in ("delete", "note") and op["uid"] not in uids:
+            raise ValueError(f"Op {n}: no entry with UID {op['uid']!r}")
+        if kind == "delete":
+            deletes.add(op["uid"])
+        elif kind == "note":
+            notes[op["uid"]] = str(op.get("note") or "")
+        elif kind == "insert":
+            topic, start, end, note = _dated(n, op)
+            new_topics.append({"topic": topic, "start": start, "end": end, "note": note})
+        else:
+            topic, start, end, note = _dated(n, op)
+            breaks.append(ScheduleEntry("Break", topic, (end - start).days + 1,
+                                        [(start.toordinal(), end.toordinal())], note, get_uid()))
+
+    kept = []
+    for entry in entries:
+        if entry.uid in deletes:
+            continue
+        if entry.uid in notes:
+            entry = entry.copy(notes=notes[entry.uid])
+        kept.append(entry)
+    return reschedule_with_interruptions(kept + breaks, new_topics=new_topics)
+
+def ops_from_records(records):
+    """Normalise imported records (any key case, "Type"/"Notes" spellings) to ops.
+
+    A record without "op" is an insert, or a break when its type is Break.
+    """
+    ops = []
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError(f"Import rows must be objects, got {record!r}")
+        record = {str(k).strip().lower(): v for k, v in record.items()}
+        kind = str(record.get("op") or "").strip().lower()
+        if not kind:
+            kind = "break" if str(record.get("type") or "").strip().lower() == "break" else "insert"
+        op = {"op": kind, "topic": record.get("topic"), "start": record.get("start"),
+              "end": record.get("end"), "note": record.get("note", record.get("notes")),
+              "uid": record.get("uid")}
+        ops.append({k: v for k, v in op.items() if v is not None})
+    return ops
+
+def read_ops(text, fmt):
+    """Ops from a CSV (header row: type/op, topic, start, end, notes, uid) or JSON list"""
+    if fmt == "json":
+        records = json.loads(text)
+        if not isinstance(records, list):
+            raise ValueError("JSON import must be a list of objects")
+    elif fmt == "csv":
+        records = list(csv.DictReader(io.StringIO(text)))
+    else:
+        raise ValueError(f"Unsupported import format {fmt!r}")
+    return ops_from_records(records)
@@ -0,0 +1,299 @@
+"""The one scheduling engine behind both DSA pages.
+
+A SchedulePolicy decides which rows are fixed breaks, how topics are laid
+out around them, how split parts are named and which column numbers the
+rows:
+
+- PINNED (daily_app): topics keep their own dates and are cut around the
+  breaks and around newly added topics; rows are numbered in "S No.".
+- PACKED (the DSA sheet page): topics only keep their length and are
+  packed back to back from the first break, skipping every break; rows are
+  numbered in "#".
+
+Both layouts share the parsing, the break classification, the interval
+index and the UID scheme, so there is one hot path to cache and optimise.
+"""
+import re
+import datetime
+from core.scheduling.entries import NUMBERING_FIELDS, ScheduleEntry, entry_uid, get_uid, part_uid
+from core.scheduling.intervals import IntervalIndex
+
+# Sort position of a row without any parseable range
+NO_RANGE = datetime.date(2099, 1, 1).toordinal()
+
+class SchedulePolicy:
+    """How the engine treats a plan; see the module docstring for the two layouts"""
+
+    __slots__ = ("name", "layout", "strict_types", "break_keywords", "break_prefix", "numbering",
+                 "part_format", "group_format", "before_format", "after_format", "_matcher", "_token")
+
+    def __init__(self, name, layout, strict_types=False, break_keywords=(), break_prefix=None,
+                 numbering="#", part_format="{topic} (part {idx} of {total})",
+                 group_format="{topic} ({idx} of {total})",
+                 before_format="{topic} (Part 1)", after_format="{topic} (continued)"):
+        self.name = name
+        self.layout = layout
+        # Strict: only "Break" rows are breaks and only "DSA" rows are topics
+        self.strict_types = strict_types
+        self.break_keywords = tuple(break_keywords)
+        self.break_prefix = break_prefix
+        self.numbering = numbering
+        self.part_format = part_format
+        self.group_format = group_format
+        self.before_format = before_format
+        self.after_format = after_format
+        # One compiled search for every topic rule: any keyword (any case)
+        # or the break prefix at the start (exact case)
+        rules = []
+        if self.break_keywords:
+            rules.append("(?i:" + "|".join(re.escape(kw) for kw in self.break_keywords) + ")")
+        if self.break_prefix:
+            rules.append("^" + re.escape(self.break_prefix))
+        self._matcher = re.compile("|".join(rules)) if rules else None
+        # Rows remember their classification under this token, so a policy
+        # with other keywords (or prefix) classifies them afresh
+        self._token = (self.break_keywords, self.break_prefix)
+
+    def is_break(self, entry):
+        if self.strict_types:
+            return entry.type == "Break"
+        cached = entry.break_flag
+        if cached is not None and (cached[0] is self._token or cached[0] == self._token):
+            return cached[1]
+        flag = self._classify(entry)
+        entry.break_flag = (self._token, flag)
+        return flag
+
+    def _classify(self, entry):
+        if (entry.type or '').lower() == "break":
+            return True
+        return self._matcher is not None and self._matcher.search(entry.topic or '') is not None
+
+    def is_topic(self, entry):
+        if self.strict_types:
+            return entry.type == "DSA"
+        return not self.is_break(entry)
+
+    def with_keywords(self, break_keywords):
+        """Copy of the policy with a different keyword list"""
+        return SchedulePolicy(self.name, self.layout, self.strict_types, break_keywords, self.break_prefix,
+                              self.numbering, self.part_format, self.group_format,
+                              self.before_format, self.after_format)
+
+PINNED = SchedulePolicy("pinned", "pinned", strict_types=True, numbering="S No.")
+PACKED = SchedulePolicy("packed", "packed", break_keywords=("CAT", "Gravitas"), break_prefix="#P")
+
+def first_day(entry):
+    return entry.ranges[0][0] if entry.ranges else NO_RANGE
+
+def as_date(d):
+    # A pandas Timestamp is a datetime subclass, so this covers it too
+    if isinstance(d, datetime.datetime):
+        return d.date()
+    return d
+
+def new_topic_range(topic):
+    """(start, end) ordinals of a {"topic", "start", "end", "note"} dict"""
+    return as_date(topic['start']).toordinal(), as_date(topic['end']).toordinal()
+
+def reschedule(entries, policy, new_topics=(), delete_uid=None, delete_index=None, today=None):
+    """Lay out a plan under policy.
+
+    entries may be ScheduleEntry objects or stored rows. new_topics are
+    {"topic", "start", "end", "note"} dicts (plus an optional "type");
+    delete_uid / delete_index drop one row first. Returns fresh entries.
+    """
+    events = [ScheduleEntry.from_row(e) for e in entries]
+    if delete_index is not None and delete_index < len(events):
+        del events[delete_index]
+    if delete_uid:
+        events = [e for e in events if e.uid != delete_uid]
+    if policy.layout == "packed":
+        return _packed(events, policy, list(new_topics), today)
+    return _pinned(events, policy, list(new_topics))
+
+# --- Pinned layout ---
+
+def _pinned(events, policy, new_topics):
+    breaks = [e for e in events if policy.is_break(e)]
+    dsa = [e for e in events if policy.is_topic(e)]
+
+    break_index = IntervalIndex(interval for br in breaks for interval in br.ranges)
+    new_ranges = [new_topic_range(t) for t in new_topics]
+    new_index = IntervalIndex(new_ranges)
+
+    # Chunks are [start, end, type, topic, notes, uid, extra]
+    split_chunks = []
+
+    today = datetime.date.today().toordinal()
+    dsa_sorted = sorted(dsa, key=lambda ev: min(s for s, _ in ev.ranges) if ev.ranges else today)
+
+    for topic in dsa_sorted:
+        topic_segments = []
+        for tstart, tend in topic.ranges:
+            # Days of the range that no new topic and no break covers
+            for seg_start, seg_end in new_index.subtract(tstart, tend):
+                topic_segments.extend(break_index.subtract(seg_start, seg_end))
+
+        topic_segments.sort()
+        total_parts = len(topic_segments)
+        notes = topic.notes if topic.notes is not None else ""
+        uid = entry_uid(topic)
+        origin = topic.extra.get("OrigUID") or uid
+        for idx, (ps, pe) in enumerate(topic_segments, 1):
+            display_topic = topic.topic
+            if total_parts > 1:
+                display_topic = policy.part_format.format(topic=display_topic, idx=idx, total=total_parts)
+            split_chunks.append([ps, pe, "DSA", display_topic, notes, part_uid(uid, idx, total_parts),
+                                 {"OrigUID": origin}])
+
+    for k, topic in enumerate(new_topics):
+        later = IntervalIndex(new_ranges[k + 1:])
+        pieces = later.subtract(*new_ranges[k])
+        uid = get_uid()
+        for idx, (ps, pe) in enumerate(pieces, 1):
+            display_topic = topic['topic']
+            if len(pieces) > 1:
+                display_topic = policy.part_format.format(topic=display_topic, idx=idx, total=len(pieces))
+            split_chunks.append([ps, pe, "DSA", display_topic, topic.get("note", ""),
+                                 part_uid(uid, idx, len(pieces)), {}])
+
+    for br in breaks:
+        notes = br.notes if br.notes is not None else ""
+        for bstart, bend in br.ranges:
+            split_chunks.append([bstart, bend, "Break", br.topic, notes, entry_uid(br), {}])
+
+    split_chunks.sort(key=lambda chunk: chunk[0])
+
+    consolidated = []
+    for chunk in split_chunks:
+        if consolidated:
+            last = consolidated[-1]
+            if chunk[2] == last[2] and chunk[3] == last[3] and last[1] + 1 == chunk[0]:
+                last[1] = chunk[1]
+                continue
+        consolidated.append(chunk)
+
+    # Chunks are in start order, so groups come out ordered by their first start
+    topic_groups = {}
+    for chunk in consolidated:
+        topic_groups.setdefault((chunk[2], chunk[3]), []).append(chunk)
+
+    # Text before the part label, e.g. " (part " for the default part_format
+    part_marker = policy.part_format.split("{idx}")[0].replace("{topic}", "")
+    result = []
+    for group_idx, (grp_key, chunks) in enumerate(topic_groups.items(), 1):
+        if grp_key[0] == "DSA":
+            total_parts = len(chunks)
+            for part_idx, (start, end, typ, name, notes, uid, extra) in enumerate(chunks, 1):
+                base_topic = name.split(part_marker)[0].strip()
+                if total_parts > 1:
+                    name = policy.group_format.format(topic=base_topic, idx=part_idx, total=total_parts)
+                else:
+                    name = base_topic
+                extra[policy.numbering] = f"{group_idx}.{part_idx}"
+                result.append(ScheduleEntry(typ, name, end - start + 1, [(start, end)], notes, uid, extra))
+        else:
+            start, end, typ, name, notes, uid, extra = chunks[0]
+            extra[policy.numbering] = str(group_idx)
+            result.append(ScheduleEntry(typ, name, end - start + 1, [(start, end)], notes, uid, extra))
+
+    return result
+
+# --- Packed layout ---
+
+def days_outside(periods, start, end):
+    """(count, first day, last day) of the periods' days before start / after end.
+
+    Same result as listing every day of every period and filtering, but per
+    period instead of per day; periods are taken in the order they are listed.
+    """
+    before = [(s, min(e, start - 1)) for s, e in periods if s < start]
+    after = [(max(s, end + 1), e) for s, e in periods if e > end]
+    before = [(s, e) for s, e in before if s <= e]
+    after = [(s, e) for s, e in after if s <= e]
+
+    def summary(pieces):
+        if not pieces:
+            return 0, None, None
+        return sum(e - s + 1 for s, e in pieces), pieces[0][0], pieces[-1][1]
+    return summary(before), summary(after)
+
+def task(entry):
+    """A moving topic only keeps (type, topic, days, notes, ranges, uid) through a repack"""
+    return (entry.type, entry.topic, entry.days, entry.notes, entry.ranges, entry.uid)
+
+def split_tasks(tasks, new_topic, policy):
+    """Split every task overlapping new_topic; the new task goes right after the first one"""
+    new_start, new_end = new_topic_range(new_topic)
+    new_task = (new_topic.get('type') or "DSA", new_topic['topic'], new_end - new_start + 1,
+                new_topic.get('note', '–'), (), get_uid())
+    packed = []
+    placed = False
+    for item in tasks:
+        # For each row, see if its range overlaps the new topic's range
+        typ, topic, _, notes, orig_periods, uid = item
+        if not any(s <= new_end and new_start <= e for s, e in orig_periods):
+            packed.append(item)
+            continue
+        # Need to split this row into up to two:
+        (n_before, _, _), (n_after, _, _) = days_outside(orig_periods, new_start, new_end)
+        if n_before:
+            packed.append((typ, policy.before_format.format(topic=topic), n_before, notes, (),
+                           part_uid(uid, 1, 2)))
+        # The new entry itself is added immediately after this (if not yet done)
+        if not placed:
+            packed.append(new_task)
+            placed = True
+        if n_after:
+            packed.append((typ, policy.after_format.format(topic=topic), n_after, notes, (),
+                           part_uid(uid, 2, 2)))
+    if not placed:
+        # Insert at end if no overlap at all
+        packed.append(new_task)
+    return packed
+
+def pack(tasks, current_day, break_index):
+    """Lay tasks back to back from current_day, skipping over the breaks"""
+    filled = []
+    for typ, topic, days, notes, _, uid in tasks:
+        avail_periods = break_index.allocate(current_day, days)
+        filled.append(ScheduleEntry(typ if typ is not None else "DSA", topic, days, avail_periods,
+                                    notes if notes is not None else "", uid))
+        # Next available date is the day after the last date just assigned
+        current_day = avail_periods[-1][1] + 1
+    return filled
+
+def fixed_break(entry, policy):
+    """Copy of a break row for the output, without the other layout's numbering"""
+    entry = entry.copy()
+    for field in NUMBERING_FIELDS:
+        entry.extra.pop(field, None)
+    return entry
+
+def number_rows(rows, policy, first=1):
+    for idx, entry in enumerate(rows, first):
+        entry.extra[policy.numbering] = idx
+    return rows
+
+def _packed(events, policy, new_topics, today):
+    today = today or datetime.date.today()
+    breaks = []
+    moving = []
+    for entry in events:
+        if policy.is_break(entry):
+            breaks.append(fixed_break(entry, policy))
+        else:
+            moving.append(task(entry))
+    for new_topic in new_topics:
+        moving = split_tasks(moving, new_topic, policy)
+
+    ordered_breaks = sorted(breaks, key=first_day)
+    # Topics start at the first break (or today), or earlier for a new topic
+    current_day = first_day(ordered_breaks[0]) if ordered_breaks else today.toordinal()
+    for new_topic in new_topics:
+        current_day = min(new_topic_range(new_topic)[0], current_day)
+    break_index = IntervalIndex(interval for br in ordered_breaks for interval in br.ranges)
+    filled = pack(moving, current_day, break_index)
+    # Merge with fixed breaks, all in chronological order
+    return number_rows(sorted(filled + ordered_breaks, key=first_day), policy)
@@ -0,0 +1,170 @@
+import datetime
+import uuid
+
+# Keys of a stored schedule row that ScheduleEntry models directly
+CORE_FIELDS = ("Type", "Topic", "Days", "Date Range", "Notes", "UID")
+# Keys that older files carry but that are derived from the ranges
+DERIVED_FIELDS = ("Start", "End")
+# Row numbers the schedulers rewrite on every call
+NUMBERING_FIELDS = ("#", "S No.")
+
+# Namespace for the derived (uuid5) IDs of split parts
+PART_NAMESPACE = uuid.UUID("6f1c1d3e-2a4b-5c8d-9e0f-1a2b3c4d5e6f")
+
+_parse_cache = {}
+
+def parse_date(s):
+    """'24/07/25' -> date ordinal, None if it does not parse"""
+    ordinal = _parse_cache.get(s)
+    if ordinal is None:
+        try:
+            ordinal = datetime.datetime.strptime(s, "%d/%m/%y").date().toordinal()
+        except ValueError:
+            return None
+        _parse_cache[s] = ordinal
+    return ordinal
+
+def format_date(ordinal):
+    return datetime.date.fromordinal(ordinal).strftime("%d/%m/%y")
+
+def format_range(start, end):
+    if start == end:
+        return format_date(start)
+    return f"{format_date(start)} – {format_date(end)}"
+
+def parse_ranges(text):
+    """'14/10/25 – 16/10/25, 19/10/25' -> ((start, end), ...) as ordinals; bad parts are skipped"""
+    ranges = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if "–" in part:
+            bounds = part.split("–")
+            start, end = parse_date(bounds[0].strip()), parse_date(bounds[1].strip())
+        else:
+            start = end = parse_date(part)
+        if start and end:
+            ranges.append((start, end))
+    return tuple(ranges)
+
+def format_ranges(ranges):
+    return ", ".join(format_range(start, end) for start, end in ranges)
+
+class ScheduleEntry:
+    """One row of a DSA schedule with its date ranges already parsed.
+
+    Ranges are (start, end) date ordinals, parsed once when a stored row is
+    loaded; the "dd/mm/yy" text is produced only by to_row() for display and
+    saving. Keys the model does not know (e.g. "#", "S No.") ride along in
+    `extra` so rows round-trip unchanged. `break_flag` caches a policy's
+    break classification of the row (see SchedulePolicy.is_break).
+    """
+
+    __slots__ = ("type", "topic", "days", "ranges", "notes", "uid", "extra", "break_flag")
+
+    def __init__(self, type, topic, days, ranges, notes="", uid=None, extra=None):
+        self.type = type
+        self.topic = topic
+        self.days = days
+        self.ranges = tuple(ranges)
+        self.notes = notes
+        self.uid = uid
+        self.extra = extra if extra is not None else {}
+        self.break_flag = None
+
+    @classmethod
+    def from_row(cls, row):
+        if isinstance(row, ScheduleEntry):
+            return row
+        extra = {k: v for k, v in row.items() if k not in CORE_FIELDS and k not in DERIVED_FIELDS}
+        return cls(row.get("Type"), row.get("Topic", ""), row.get("Days"),
+                   parse_ranges(row.get("Date Range", "")), row.get("Notes"), row.get("UID"), extra)
+
+    def to_row(self):
+        row = {}
+        if self.type is not None:
+            row["Type"] = self.type
+        row["Topic"] = self.topic
+        row["Days"] = self.days
+        row["Date Range"] = self.date_range
+        if self.notes is not None:
+            row["Notes"] = self.notes
+        if self.uid is not None:
+            row["UID"] = self.uid
+        row.update(self.extra)
+        return row
+
+    def copy(self, **changes):
+        entry = ScheduleEntry(self.type, self.topic, self.days, self.ranges, self.notes, self.uid, dict(self.extra))
+        if "type" not in changes and "topic" not in changes:
+            entry.break_flag = self.break_flag
+        for name, value in changes.items():
+            setattr(entry, name, value)
+        return entry
+
+    @property
+    def date_range(self):
+        return format_ranges(self.ranges)
+
+    @property
+    def start(self):
+        """First day (ordinal) of the first range, None when there are no ranges"""
+        return self.ranges[0][0] if self.ranges else None
+
+    @property
+    def end(self):
+        return self.ranges[-1][1] if self.ranges else None
+
+    def key(self):
+        """Hashable tuple of everything to_row() would emit"""
+        return (self.type, self.topic, self.days, self.ranges, self.notes, self.uid,
+                tuple(self.extra.items()))
+
+    def content_key(self):
+        """key() without the row numbering, which shifts whenever an earlier row changes"""
+        return (self.type, self.topic, self.days, self.ranges, self.notes, self.uid,
+                tuple(item for item in self.extra.items() if item[0] not in NUMBERING_FIELDS))
+
+    def __repr__(self):
+        return f"ScheduleEntry({self.type!r}, {self.topic!r}, {self.date_range!r})"
+
+def get_uid():
+    return str(uuid.uuid4())
+
+def entry_uid(entry):
+    """The entry's UID, or one derived from its content for rows saved without one"""
+    if entry.uid:
+        return entry.uid
+    return str(uuid.uuid5(PART_NAMESPACE, f"{entry.type}|{entry.topic}|{entry.ranges}"))
+
+def part_uid(uid, part_idx, total_parts):
+    """Stable ID of part part_idx of a topic: a topic that is not split keeps its own UID"""
+    if total_parts == 1 or uid is None:
+        return uid
+    return str(uuid.uuid5(PART_NAMESPACE, f"{uid}/{part_idx}"))
+
+def entries_from_rows(rows):
+    """Parse stored rows once; empty placeholder rows are dropped"""
+    return [ScheduleEntry.from_row(row) for row in rows or [] if row]
+
+def fingerprint(entries):
+    """Content hash of a schedule, for caching work derived from it across reruns"""
+    return hash(tuple(entry.key() for entry in entries))
+
+def diff_schedules(old, new):
+    """What changed between two versions of a plan, matching entries by UID.
+
+    Returns {"added": [...], "removed": [...], "changed": [(before, after), ...]};
+    renumbering alone does not count as a change.
+    """
+    before = {entry.uid: entry for entry in old}
+    after = {entry.uid: entry for entry in new}
+    return {
+        "added": [entry for entry in new if entry.uid not in before],
+        "removed": [entry for entry in old if entry.uid not in after],
+        "changed": [(before[entry.uid], entry) for entry in new
+                    if entry.uid in before and before[entry.uid].content_key() != entry.content_key()],
+    }
+
+def rows_from_entries(entries):
+    """JSON-ready rows for saving or building a table"""
+    return [entry.to_row() for entry in entries]
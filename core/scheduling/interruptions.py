@@ -0,0 +1,28 @@
+from core.scheduling.engine import PINNED, as_date as _as_date, reschedule
+from core.scheduling.entries import entry_uid, get_uid, part_uid  # re-exported for callers
+
+def date_fmt(dt):
+    dt = _as_date(dt)
+    return dt.strftime('%d/%m/%y')
+
+def daterange_fmt(start, end):
+    start, end = _as_date(start), _as_date(end)
+    if start == end:
+        return date_fmt(start)
+    return f"{date_fmt(start)} – {date_fmt(end)}"
+
+def reschedule_with_interruptions(entries, new_topic=None, delete_uid=None, new_topics=()):
+    """Split DSA topics around breaks (and newly added topics).
+
+    new_topic / new_topics are {"topic", "start", "end", "note"} dicts; existing
+    topics give way to every one of them, and a later new topic also takes
+    its days from an earlier one it overlaps.
+
+    entries may be ScheduleEntry objects or stored rows; rows are parsed once
+    and all date work happens on ordinals. Returns fresh ScheduleEntry objects
+    whose UIDs derive from the topic they came from, so an unchanged plan
+    keeps its UIDs from one call to the next. This is the engine's pinned
+    layout (see core.scheduling.engine).
+    """
+    new_topics = list(new_topics) + ([new_topic] if new_topic else [])
+    return reschedule(entries, PINNED, new_topics=new_topics, delete_uid=delete_uid)
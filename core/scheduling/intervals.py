@@ -0,0 +1,101 @@
+import bisect
+
+# Intervals are inclusive (start, end) pairs of date ordinals
+# (datetime.date.toordinal()), so "next day" is simply +1.
+
+def merge_intervals(intervals):
+    """Sort inclusive (start, end) intervals and merge overlapping/adjacent ones"""
+    merged = []
+    for start, end in sorted(intervals):
+        if start > end:
+            continue
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+class IntervalIndex:
+    """Merged, sorted break intervals searched with bisect.
+
+    Every query locates its first candidate interval in O(log B) and then only
+    touches the intervals it actually overlaps.
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = merge_intervals(intervals)
+        self.starts = [start for start, _ in self.intervals]
+        self._covered_before = None
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def _first_ending_on_or_after(self, day):
+        """Index of the first interval whose end is >= day"""
+        i = bisect.bisect_right(self.starts, day) - 1
+        if i >= 0 and self.intervals[i][1] >= day:
+            return i
+        return i + 1
+
+    def covers(self, day):
+        i = bisect.bisect_right(self.starts, day) - 1
+        return i >= 0 and self.intervals[i][1] >= day
+
+    def covered_days(self, start, end):
+        """How many days of [start, end] the intervals cover, in O(log B)"""
+        if self._covered_before is None:
+            # _covered_before[i]: days covered by intervals[:i]
+            total = 0
+            self._covered_before = [0]
+            for s, e in self.intervals:
+                total += e - s + 1
+                self._covered_before.append(total)
+
+        def up_to(day):
+            # Days covered on or before day
+            i = bisect.bisect_right(self.starts, day)
+            if i == 0:
+                return 0
+            s, e = self.intervals[i - 1]
+            return self._covered_before[i - 1] + min(e, day) - s + 1
+        return up_to(end) - up_to(start - 1) if start <= end else 0
+
+    def allocate(self, start, days):
+        """Pieces holding `days` free days from start onward, skipping the intervals.
+
+        O(log B) to find the first interval, then O(1) per returned piece no
+        matter how many days each piece spans.
+        """
+        pieces = []
+        current = start
+        remaining = days
+        i = self._first_ending_on_or_after(current)
+        while remaining > 0:
+            if i < len(self.intervals) and self.intervals[i][0] <= current:
+                current = self.intervals[i][1] + 1
+                i += 1
+                continue
+            end = current + remaining - 1
+            if i < len(self.intervals) and end >= self.intervals[i][0]:
+                end = self.intervals[i][0] - 1
+            pieces.append((current, end))
+            remaining -= end - current + 1
+            current = end + 1
+        return pieces
+
+    def subtract(self, start, end):
+        """Free (start, end) pieces of [start, end] that no interval covers"""
+        pieces = []
+        i = self._first_ending_on_or_after(start)
+        current = start
+        while current <= end:
+            if i >= len(self.intervals) or self.intervals[i][0] > end:
+                pieces.append((current, end))
+                break
+            bstart, bend = self.intervals[i]
+            if bstart > current:
+                pieces.append((current, bstart - 1))
+            current = bend + 1
+            i += 1
+        return pieces
@@ -0,0 +1,87 @@
+import bisect
+import heapq
+import datetime
+from core.scheduling.engine import PINNED
+from core.scheduling.entries import ScheduleEntry
+from core.scheduling.intervals import IntervalIndex
+
+# A placement never overlaps a break. Among the break-free windows of the
+# requested length the search prefers, in order: fewer existing topics cut
+# in two, fewer days taken from existing topics, an earlier start.
+#
+# Between two consecutive starts where an edge of the window meets an edge
+# of a topic range (or of the gap), splits stay the same and displaced days
+# change linearly, so the best window starts at one of those O(n) points;
+# only they are scored, each in O(log n).
+
+class _TopicRanges:
+    """Topic date ranges sorted by start, for counting the ones a window cuts in two"""
+
+    def __init__(self, ranges):
+        self.ranges = sorted(ranges)
+        self.starts = [start for start, _ in self.ranges]
+        # reach[i]: latest end among ranges[:i + 1]
+        self.reach = []
+        latest = None
+        for _, end in self.ranges:
+            latest = end if latest is None else max(latest, end)
+            self.reach.append(latest)
+
+    def splits(self, start, end):
+        """Ranges that have days both before start and after end"""
+        count = 0
+        i = bisect.bisect_left(self.starts, start) - 1
+        # Stop at the first prefix that ends by `end`: nothing before it can reach past
+        while i >= 0 and self.reach[i] > end:
+            if self.ranges[i][1] > end:
+                count += 1
+            i -= 1
+        return count
+
+def _candidate_starts(gap_start, gap_end, days, topic_ranges):
+    """Window starts in a break-free gap worth scoring"""
+    last = gap_end - days + 1
+    starts = {gap_start, last}
+    lo = bisect.bisect_left(topic_ranges.starts, gap_start - days)
+    for start, end in topic_ranges.ranges[lo:]:
+        if start > gap_end + days:
+            break
+        starts.update((start, end + 1, start - days, end - days + 1))
+    # Ranges starting before the gap can still end inside it
+    i = lo - 1
+    while i >= 0 and topic_ranges.reach[i] >= gap_start:
+        end = topic_ranges.ranges[i][1]
+        starts.update((end + 1, end - days + 1))
+        i -= 1
+    return [s for s in starts if gap_start <= s <= last]
+
+def find_placements(entries, days, k=1, not_before=None, policy=PINNED):
+    """The k best break-free windows of `days` days for a new topic.
+
+    entries may be ScheduleEntry objects or stored rows; breaks and topics
+    are told apart by policy. Returns dicts with "start"/"end" dates, the
+    "splits" (topics cut in two) and "displaced" (topic days taken), best
+    first. Alternatives are the scored starts, not the best slot shifted by
+    a day. The search ends one window past the last row, which always fits
+    with no splits.
+    """
+    if days < 1:
+        raise ValueError("A topic needs at least one day")
+    entries = [ScheduleEntry.from_row(e) for e in entries]
+    not_before = (not_before or datetime.date.today()).toordinal()
+    breaks = IntervalIndex(r for e in entries if policy.is_break(e) for r in e.ranges)
+    topic_ranges = _TopicRanges(r for e in entries if policy.is_topic(e) for r in e.ranges)
+    covered = IntervalIndex(topic_ranges.ranges)
+
+    last_day = max([not_before] + [end for _, end in breaks.intervals] + [end for _, end in covered.intervals])
+    scored = []
+    for gap_start, gap_end in breaks.subtract(not_before, last_day + days):
+        if gap_end - gap_start + 1 < days:
+            continue
+        for start in _candidate_starts(gap_start, gap_end, days, topic_ranges):
+            end = start + days - 1
+            scored.append((topic_ranges.splits(start, end), covered.covered_days(start, end), start))
+
+    return [{"start": datetime.date.fromordinal(start), "end": datetime.date.fromordinal(start + days - 1),
+             "splits": splits, "displaced": displaced}
+            for splits, displaced, start in heapq.nsmallest(k, scored)]
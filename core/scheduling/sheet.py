@@ -0,0 +1,181 @@
+from core.scheduling.engine import (NO_RANGE as _NO_RANGE, PACKED, first_day as _first_day, fixed_break,
+                                    number_rows, pack, reschedule, split_tasks, task)
+from core.scheduling.entries import ScheduleEntry
+from core.scheduling.intervals import IntervalIndex
+
+# Topics containing these words are fixed breaks even when typed as DSA
+FIXED_KEYWORDS = ["CAT", "Gravitas"]
+
+# Packed policies by keyword tuple, so each keyword set compiles its break regex once
+_policies = {}
+
+def sheet_policy(fixed_keywords=FIXED_KEYWORDS):
+    key = tuple(fixed_keywords)
+    policy = _policies.get(key)
+    if policy is None:
+        policy = _policies[key] = PACKED.with_keywords(key)
+    return policy
+
+def is_break(entry, fixed_keywords=FIXED_KEYWORDS):
+    # Type "break" (any case), a keyword in the topic, or #P... style
+    return sheet_policy(fixed_keywords).is_break(entry)
+
+# --- Find all break periods (returns list of (start,end) ordinal tuples) ---
+def get_break_periods(sheet, fixed_keywords=FIXED_KEYWORDS):
+    policy = sheet_policy(fixed_keywords)
+    periods = []
+    for entry in sheet:
+        if policy.is_break(entry):
+            periods += entry.ranges
+    return periods
+
+def _as_topic(new_entry):
+    """The page's {"Type", "Topic", "Start", "End", "Notes"} dict as an engine new topic"""
+    topic = {"type": new_entry.get('Type'), "topic": new_entry['Topic'],
+             "start": new_entry['Start'], "end": new_entry['End']}
+    if 'Notes' in new_entry:
+        topic["note"] = new_entry['Notes']
+    return topic
+
+# --- Given a schedule, split/shift DSA topics as needed, with breaks fixed ---
+def rebuild_schedule_with_new(sheet, new_entry=None, delete_row_idx=None, today=None,
+                              fixed_keywords=FIXED_KEYWORDS):
+    """
+    - sheet: list of current ScheduleEntry objects (stored row dicts are parsed).
+    - new_entry: Optional dict for new topic. If None, means just to repack after delete.
+    - delete_row_idx: Optional index to delete, before rescheduling.
+    Returns: new list of ScheduleEntry, with all DSA topics fit around breaks
+    (the engine's packed layout, see core.scheduling.engine).
+    """
+    new_topics = [_as_topic(new_entry)] if new_entry is not None else []
+    return reschedule(sheet, sheet_policy(fixed_keywords), new_topics=new_topics,
+                      delete_index=delete_row_idx, today=today)
+
+# --- Incremental edits: keep the rows before the edit point, repack the rest ---
+#
+# These expect `sheet` to be what rebuild_schedule_with_new returned (rows in
+# chronological order, topics packed back to back around the breaks). Then
+# everything before the first topic an edit can move stays exactly where it
+# is, and the result matches a full rebuild. When an edit would move the
+# packing start (a new first break, deleting the first break, a topic added
+# before it, or no breaks at all) they fall back to the full rebuild. So do
+# they for a sheet with topics before its first break (left by adding a topic
+# there): a rebuild moves those back to the first break.
+
+def _first_at_or_after(sheet, day):
+    """Index of the first row whose first day is >= day (rows are chronological)"""
+    lo, hi = 0, len(sheet)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _first_day(sheet[mid]) < day:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _first_break(sheet, fixed_keywords):
+    """Index of the earliest break, None without breaks"""
+    for i, entry in enumerate(sheet):
+        if is_break(entry, fixed_keywords):
+            return i
+    return None
+
+def _packed_from_first_break(sheet, first):
+    """False when a topic starts before the first break, so a rebuild would move it"""
+    return first is not None and _first_day(sheet[0]) >= _first_day(sheet[first])
+
+def _topic_before(sheet, idx, day, fixed_keywords):
+    """Nearest moving topic in sheet[:idx] that ends before day, None if there is none"""
+    for i in range(idx - 1, -1, -1):
+        entry = sheet[i]
+        if entry.ranges and not is_break(entry, fixed_keywords) and entry.end < day:
+            return entry
+    return None
+
+def _repack_tail(sheet, cut_day, new_entry=None, new_breaks=(), skip=None,
+                 fixed_keywords=FIXED_KEYWORDS):
+    """Rows starting before cut_day as-is, everything after repacked from cut_day; `skip` is dropped"""
+    policy = sheet_policy(fixed_keywords)
+    p = _first_at_or_after(sheet, cut_day)
+    breaks = []
+    tasks = []
+    for entry in sheet[p:]:
+        if entry is skip:
+            continue
+        if policy.is_break(entry):
+            breaks.append(fixed_break(entry, policy))
+        else:
+            tasks.append(task(entry))
+    breaks += new_breaks
+    if new_entry is not None:
+        tasks = split_tasks(tasks, _as_topic(new_entry), policy)
+    # Breaks still covering days from cut_day on: the tail's, plus any just
+    # before p that run past cut_day
+    periods = get_break_periods(breaks, fixed_keywords)
+    for i in range(p - 1, -1, -1):
+        entry = sheet[i]
+        if not policy.is_break(entry):
+            break
+        periods += [(s, e) for s, e in entry.ranges if e >= cut_day]
+    filled = pack(tasks, cut_day, IntervalIndex(periods))
+    rows = sorted(filled + sorted(breaks, key=_first_day), key=_first_day)
+    return sheet[:p] + number_rows(rows, policy, p + 1)
+
+def delete_entry(sheet, row_idx, today=None, fixed_keywords=FIXED_KEYWORDS):
+    """Drop sheet[row_idx] and repack only the topics that can move because of it"""
+    sheet = [ScheduleEntry.from_row(row) for row in sheet]
+    first = _first_break(sheet, fixed_keywords)
+    if not _packed_from_first_break(sheet, first) or row_idx >= len(sheet) or row_idx == first:
+        return rebuild_schedule_with_new(sheet, delete_row_idx=row_idx, today=today,
+                                         fixed_keywords=fixed_keywords)
+    target = sheet[row_idx]
+    # Topics from the first one reaching the deleted row's first day onward
+    day = _first_day(target)
+    prev = _topic_before(sheet, row_idx, day, fixed_keywords)
+    cut_day = prev.end + 1 if prev else _first_day(sheet[first])
+    return _repack_tail(sheet, cut_day, skip=target, fixed_keywords=fixed_keywords)
+
+def insert_break(sheet, entry, today=None, fixed_keywords=FIXED_KEYWORDS):
+    """Add a fixed break and repack only the topics from its first day onward"""
+    sheet = [ScheduleEntry.from_row(row) for row in sheet]
+    entry = ScheduleEntry.from_row(entry)
+    first = _first_break(sheet, fixed_keywords)
+    day = _first_day(entry)
+    if (not _packed_from_first_break(sheet, first) or day < _first_day(sheet[first])
+            or not is_break(entry, fixed_keywords)):
+        return rebuild_schedule_with_new(sheet + [entry], today=today, fixed_keywords=fixed_keywords)
+    prev = _topic_before(sheet, _first_at_or_after(sheet, day), day, fixed_keywords)
+    cut_day = prev.end + 1 if prev else _first_day(sheet[first])
+    return _repack_tail(sheet, cut_day, new_breaks=[fixed_break(entry, sheet_policy(fixed_keywords))],
+                        fixed_keywords=fixed_keywords)
+
+def insert_entry(sheet, new_entry, today=None, fixed_keywords=FIXED_KEYWORDS):
+    """Add a DSA topic (same dict as rebuild_schedule_with_new's new_entry), repacking from the first topic it splits"""
+    sheet = [ScheduleEntry.from_row(row) for row in sheet]
+    first = _first_break(sheet, fixed_keywords)
+    new_start, new_end = new_entry['Start'].toordinal(), new_entry['End'].toordinal()
+    if not _packed_from_first_break(sheet, first) or new_start < _first_day(sheet[first]):
+        return rebuild_schedule_with_new(sheet, new_entry=new_entry, today=today,
+                                         fixed_keywords=fixed_keywords)
+    # The first topic with a day inside the new range, starting from the one
+    # topic that may begin before new_start and run into it
+    start = _first_at_or_after(sheet, new_start)
+    while start > 0 and is_break(sheet[start - 1], fixed_keywords):
+        start -= 1
+    hit = None
+    for i in range(max(start - 1, 0), len(sheet)):
+        entry = sheet[i]
+        if _first_day(entry) > new_end:
+            break
+        if not is_break(entry, fixed_keywords) and any(s <= new_end and new_start <= e
+                                                       for s, e in entry.ranges):
+            hit = i
+            break
+    if hit is None:
+        # No overlap: the new topic is simply packed after the last one
+        last = _topic_before(sheet, len(sheet), _NO_RANGE, fixed_keywords)
+        cut_day = last.end + 1 if last else _first_day(sheet[first])
+        return _repack_tail(sheet, cut_day, new_entry=new_entry, fixed_keywords=fixed_keywords)
+    prev = _topic_before(sheet, hit, _first_day(sheet[hit]), fixed_keywords)
+    cut_day = prev.end + 1 if prev else _first_day(sheet[first])
+    return _repack_tail(sheet, cut_day, new_entry=new_entry, fixed_keywords=fixed_keywords)
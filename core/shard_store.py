@@ -0,0 +1,58 @@
+import os
+import copy
+from core import journal
+from core.storage import JournalBackend, read_json, split_snapshot, write_json_atomic
+
+SHARD_DIR = "data"
+
+class ShardedBackend:
+    """One JSON file per top-level collection: data/<collection>.json.
+
+    A write atomically rewrites only the shards its records touch, so saving
+    one habit never re-serializes the other collections. An existing
+    data.json (with its journal) is split into shards on first load.
+    """
+
+    def __init__(self, root=SHARD_DIR, legacy_path="data.json"):
+        self.root = root
+        self.legacy_path = legacy_path
+        # load()'s defaults, the base for a keyed write to a shard not written yet
+        self.defaults = {}
+
+    def _path(self, name):
+        return os.path.join(self.root, f"{name}.json")
+
+    def names(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.root) if name.endswith(".json"))
+
+    def load_collection(self, name, default=None):
+        """A single shard, without reading any other"""
+        return read_json(self._path(name), default)
+
+    def load(self, default):
+        self.defaults = default
+        if not os.path.isdir(self.root) and os.path.exists(self.legacy_path):
+            self.write([{"snapshot": JournalBackend(self.legacy_path).load(default)}])
+        names = self.names()
+        if not names:
+            return copy.deepcopy(default)
+        return {name: self.load_collection(name) for name in names}
+
+    def write(self, records):
+        snapshot, tail = split_snapshot(records)
+        # Final value of every touched shard, each written once below
+        shards = dict(snapshot) if snapshot is not None else {}
+        for record in tail:
+            name = record["c"]
+            if name not in shards and record["p"]:
+                shards[name] = self.load_collection(name, self.defaults.get(name, {}))
+            journal.apply_record(shards, record)
+        if shards:
+            os.makedirs(self.root, exist_ok=True)
+        for name, value in shards.items():
+            write_json_atomic(self._path(name), value)
+
+    def needs_compaction(self):
+        return False
@@ -0,0 +1,33 @@
+import threading
+
+class SharedStore:
+    """One parsed copy of the app data for every session in the process.
+
+    The data is loaded and parsed once per process. Sessions bind the
+    stored objects themselves and treat them as read-only; one copies a
+    collection only to change it (see data_handler.editable). A save
+    publishes the session's object here, without copying, and bumps its
+    version; every other session rebinds it on its next rerun. The stored
+    objects are never mutated after publishing, so reading them needs no lock.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.versions = {name: 0 for name in data}
+        self.lock = threading.Lock()
+
+    def changed_since(self, seen):
+        """{name: (version, value)} of the collections whose version differs from seen"""
+        with self.lock:
+            return {name: (version, self.data[name]) for name, version in self.versions.items()
+                    if seen.get(name) != version}
+
+    def publish(self, name, value):
+        """Make value the shared collection; returns its new version.
+
+        The caller hands value over and must not change it afterwards.
+        """
+        with self.lock:
+            self.data[name] = value
+            self.versions[name] = self.versions.get(name, 0) + 1
+            return self.versions[name]
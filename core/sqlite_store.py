@@ -0,0 +1,187 @@
+import copy
+import json
+import sqlite3
+import threading
+from core.storage import DATE_KEYED_COLLECTIONS, json_default, split_snapshot
+
+DB_FILE = "data.db"
+CLASSROOM = "completed_classroom_tasks"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS habit_record (
+    habit TEXT NOT NULL,
+    day TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (habit, day)
+);
+CREATE INDEX IF NOT EXISTS habit_record_day ON habit_record (day);
+CREATE TABLE IF NOT EXISTS classroom_completion (
+    subject TEXT NOT NULL,
+    day TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    topic TEXT NOT NULL,
+    PRIMARY KEY (subject, day, position)
+);
+CREATE INDEX IF NOT EXISTS classroom_completion_day ON classroom_completion (day);
+CREATE TABLE IF NOT EXISTS collection (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def _dumps(value):
+    return json.dumps(value, default=json_default)
+
+class SqliteBackend:
+    """Date-keyed collections as indexed rows, everything else as JSON blobs.
+
+    A changed day is a single-row UPSERT and month views are range queries
+    on day; data.json remains the import/export format (see core.migrate).
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # Date-keyed habits left out of load() because they are read per month
+        self.lazy_habits = ()
+        # load()'s defaults, the base for a keyed write to a collection not stored yet
+        self.defaults = {}
+        # Shared with the async writer thread, so every call takes the lock
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    # ---- reading ----
+    def load(self, default):
+        self.defaults = default
+        with self.lock:
+            return self._load(default)
+
+    def _load(self, default):
+        data = {}
+        for name, value in self.conn.execute("SELECT name, value FROM collection"):
+            data[name] = json.loads(value)
+        for habit in DATE_KEYED_COLLECTIONS:
+            data[habit] = {}
+        skip = tuple(self.lazy_habits)
+        rows = self.conn.execute(
+            "SELECT habit, day, value FROM habit_record "
+            f"WHERE habit NOT IN ({', '.join('?' * len(skip))}) ORDER BY day", skip)
+        for habit, day, value in rows:
+            data.setdefault(habit, {})[day] = json.loads(value)
+        completed = {subject: {} for subject in default.get(CLASSROOM, {})}
+        for subject in data.get("classroom_tasks", {}):
+            completed.setdefault(subject, {})
+        rows = self.conn.execute("SELECT subject, day, topic FROM classroom_completion ORDER BY day, position")
+        for subject, day, topic in rows:
+            completed.setdefault(subject, {}).setdefault(day, []).append(topic)
+        data[CLASSROOM] = completed
+        return data
+
+    def load_range(self, habit, start, end):
+        """{day: value} for one habit between ISO dates start and end inclusive"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT day, value FROM habit_record WHERE habit = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (habit, start, end)).fetchall()
+        return {day: json.loads(value) for day, value in rows}
+
+    def months(self, habit):
+        """Months ('YYYY-MM') that have rows for habit, for MonthPartitionedRecords"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT substr(day, 1, 7) FROM habit_record WHERE habit = ? ORDER BY 1",
+                (habit,)).fetchall()
+        return [row[0] for row in rows]
+
+    def month_totals(self, habit):
+        """{month: [sum, count]} of habit's values, for the stats"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT substr(day, 1, 7), SUM(CAST(json_extract(value, '$') AS INTEGER)), COUNT(*) "
+                "FROM habit_record WHERE habit = ? GROUP BY 1 ORDER BY 1", (habit,)).fetchall()
+        return {month: [total, count] for month, total, count in rows}
+
+    def load_month(self, habit, month):
+        return self.load_range(habit, f"{month}-01", f"{month}-31")
+
+    def load_collection(self, name, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM collection WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    # ---- writing ----
+    def _put_habit(self, habit, day, value):
+        self.conn.execute(
+            "INSERT INTO habit_record (habit, day, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (habit, day) DO UPDATE SET value = excluded.value",
+            (habit, day, _dumps(value)))
+
+    def _put_topics(self, subject, day, topics):
+        self.conn.execute("DELETE FROM classroom_completion WHERE subject = ? AND day = ?", (subject, day))
+        self.conn.executemany(
+            "INSERT INTO classroom_completion (subject, day, position, topic) VALUES (?, ?, ?, ?)",
+            [(subject, day, pos, topic) for pos, topic in enumerate(topics or [])])
+
+    def _put_collection(self, name, value):
+        self.conn.execute(
+            "INSERT INTO collection (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (name, _dumps(value)))
+
+    def _replace_all(self, data):
+        # Collections missing from the snapshot (e.g. partitioned history) are kept
+        for name, value in data.items():
+            self._apply({"c": name, "p": [], "v": value})
+
+    def _apply(self, record):
+        name, path = record["c"], record["p"]
+        deleted = record.get("d")
+        value = record.get("v")
+        if name in DATE_KEYED_COLLECTIONS:
+            if not path:
+                self.conn.execute("DELETE FROM habit_record WHERE habit = ?", (name,))
+                for day, day_value in (value or {}).items():
+                    self._put_habit(name, day, day_value)
+            elif deleted:
+                self.conn.execute("DELETE FROM habit_record WHERE habit = ? AND day = ?", (name, path[0]))
+            else:
+                self._put_habit(name, path[0], value)
+        elif name == CLASSROOM:
+            if not path:
+                self.conn.execute("DELETE FROM classroom_completion")
+                for subject, days in (value or {}).items():
+                    for day, topics in days.items():
+                        self._put_topics(subject, day, topics)
+            elif len(path) == 1:
+                self.conn.execute("DELETE FROM classroom_completion WHERE subject = ?", (path[0],))
+                for day, topics in ({} if deleted else value).items():
+                    self._put_topics(path[0], day, topics)
+            else:
+                self._put_topics(path[0], path[1], None if deleted else value)
+        elif not path:
+            if deleted:
+                self.conn.execute("DELETE FROM collection WHERE name = ?", (name,))
+            else:
+                self._put_collection(name, value)
+        else:
+            # Patch inside a blob collection, e.g. one password folder
+            blob = self.load_collection(name, copy.deepcopy(self.defaults.get(name, {})))
+            node = blob
+            for part in path[:-1]:
+                node = node.setdefault(part, {})
+            if deleted:
+                node.pop(path[-1], None)
+            else:
+                node[path[-1]] = value
+            self._put_collection(name, blob)
+
+    def write(self, records):
+        snapshot, tail = split_snapshot(records)
+        with self.lock, self.conn:
+            if snapshot is not None:
+                self._replace_all(snapshot)
+            for record in tail:
+                self._apply(record)
+
+    def needs_compaction(self):
+        return False
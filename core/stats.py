@@ -0,0 +1,152 @@
+import datetime
+import streamlit as st
+from core.storage import BITMAP_HABITS
+from core.habit_log import HabitLog
+
+HABIT_LABELS = {
+    "duolingo_records": "Duolingo",
+    "morning_exercise_records": "Morning Exercise",
+    "jawline_records": "Jawline Routine",
+    "water_main_checklist": "Big Water Checklist",
+}
+WINDOWS = (7, 30, 365)
+
+def _month_key(day):
+    return day.isoformat()[:7]
+
+class StatsEngine:
+    """Streaks, completion rates and water averages kept up to date per save.
+
+    rebuild() reads the habit bitsets and the stored per-month water totals
+    (see core.partitions), never the water month files; after that on_save() only
+    recomputes the touched habit (a few bitset operations) or the touched
+    month of water counts, so rendering the summary never rescans history.
+    """
+
+    def __init__(self):
+        self.habits = {}
+        self.water = {}
+        self.water_months = {}
+
+    # ---- building ----
+    def rebuild(self, state):
+        for name in BITMAP_HABITS:
+            self._update_habit(name, state[name])
+        self.water = state["water_counts"]
+        self.water_months = {}
+        if hasattr(self.water, "month_totals"):
+            # Stored per-month totals: no month file is read to build the stats
+            for month, (month_sum, month_count) in self.water.month_totals().items():
+                if month_count:
+                    self.water_months[month] = (month_sum, month_count)
+            return self
+        for month in sorted({day[:7] for day in self.water}):
+            self._update_water_month(month)
+        return self
+
+    def _update_habit(self, name, records):
+        log = records if isinstance(records, HabitLog) else HabitLog.from_dict(records)
+        self.habits[name] = {"log": log, "longest": log.longest_streak()}
+
+    def _water_days(self, month):
+        if hasattr(self.water, "month"):
+            return self.water.month(month)
+        return {day: value for day, value in self.water.items() if day.startswith(month)}
+
+    def _update_water_month(self, month):
+        values = [int(v) for v in self._water_days(month).values()]
+        if values:
+            self.water_months[month] = (sum(values), len(values))
+        else:
+            self.water_months.pop(month, None)
+
+    def on_save(self, state, collection, key=None):
+        """Fold one save_data() call into the stats"""
+        if collection is None:
+            self.rebuild(state)
+        elif collection in BITMAP_HABITS:
+            self._update_habit(collection, state[collection])
+        elif collection == "water_counts":
+            if not isinstance(key, str) or self.water is not state["water_counts"]:
+                self.rebuild(state)
+            else:
+                self._update_water_month(key[:7])
+
+    # ---- reading ----
+    def habit_summary(self, name, today):
+        log = self.habits[name]["log"]
+        row = {
+            "current_streak": log.current_streak(today),
+            "longest_streak": self.habits[name]["longest"],
+        }
+        for window in WINDOWS:
+            start = today - datetime.timedelta(days=window - 1)
+            row[f"rate_{window}"] = log.count_between(start, today) / window
+        return row
+
+    def water_average(self, today, window):
+        """Average water count over recorded days in the last `window` days"""
+        start = today - datetime.timedelta(days=window - 1)
+        first, last = _month_key(start), _month_key(today)
+        total = count = 0
+        for month, (month_sum, month_count) in self.water_months.items():
+            if month < first or month > last:
+                continue
+            if first < month < last:
+                total += month_sum
+                count += month_count
+                continue
+            # Edge months are only partly inside the window
+            for day, value in self._water_days(month).items():
+                if start.isoformat() <= day <= today.isoformat():
+                    total += int(value)
+                    count += 1
+        return total / count if count else None
+
+    def summary(self, today=None):
+        today = today or datetime.date.today()
+        result = {name: self.habit_summary(name, today) for name in BITMAP_HABITS if name in self.habits}
+        result["water_counts"] = {f"avg_{window}": self.water_average(today, window) for window in WINDOWS}
+        return result
+
+def get_stats():
+    """Session StatsEngine, built from existing data on first use"""
+    engine = st.session_state.get("_stats")
+    if engine is None:
+        engine = StatsEngine().rebuild(st.session_state)
+        st.session_state["_stats"] = engine
+    return engine
+
+def on_save(collection, key=None):
+    """Hook for save_data(); does nothing until the stats are first requested"""
+    engine = st.session_state.get("_stats")
+    if engine is not None:
+        engine.on_save(st.session_state, collection, key)
+
+def _pct(rate):
+    return f"{rate * 100:.0f}%"
+
+def render_stats_panel(title="📈 Habit Summary"):
+    """Summary table of streaks, completion rates and water averages"""
+    stats = get_stats().summary()
+    rows = []
+    for name, label in HABIT_LABELS.items():
+        s = stats.get(name)
+        if s is None:
+            continue
+        rows.append(
+            f"<tr><td style='text-align:left'>{label}</td><td>{s['current_streak']}</td><td>{s['longest_streak']}</td>"
+            f"<td>{_pct(s['rate_7'])}</td><td>{_pct(s['rate_30'])}</td><td>{_pct(s['rate_365'])}</td></tr>"
+        )
+    water = stats["water_counts"]
+    averages = "".join(
+        f"<td>{water[f'avg_{w}']:.1f}</td>" if water[f"avg_{w}"] is not None else "<td>–</td>" for w in WINDOWS
+    )
+    rows.append(f"<tr><td style='text-align:left'>Water Count (avg)</td><td>–</td><td>–</td>{averages}</tr>")
+    st.markdown(f"##### {title}")
+    st.markdown(
+        "<table style='width:100%;text-align:center;font-size:15px;'>"
+        "<tr><th style='text-align:left'>Tracker</th><th>Streak</th><th>Longest</th><th>7 days</th><th>30 days</th><th>365 days</th></tr>"
+        + "".join(rows) + "</table>",
+        unsafe_allow_html=True,
+    )
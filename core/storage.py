@@ -0,0 +1,120 @@
+import os
+import copy
+import json
+import datetime
+from core import journal
+
+# Collections keyed by ISO date that grow by one entry per day
+DATE_KEYED_COLLECTIONS = (
+    "duolingo_records",
+    "morning_exercise_records",
+    "jawline_records",
+    "dairy_records",
+    "water_counts",
+    "water_checklists",
+    "water_main_checklist",
+)
+
+# Boolean daily habits, kept in memory as bitsets (core.habit_log)
+BITMAP_HABITS = (
+    "duolingo_records",
+    "morning_exercise_records",
+    "jawline_records",
+    "water_main_checklist",
+)
+
+# Every backend speaks the same two calls:
+#   load(default) -> dict of collections
+#   write(records) -> persist journal-style records ({"c", "p", "v"/"d"})
+#                     or {"snapshot": data} to replace everything
+
+def split_snapshot(records):
+    """Return (latest snapshot or None, records that come after it)"""
+    snapshot = None
+    tail = []
+    for record in records:
+        if "snapshot" in record:
+            snapshot = record["snapshot"]
+            tail = []
+        else:
+            tail.append(record)
+    return snapshot, tail
+
+def json_default(value):
+    """Dates are stored as their ISO string; anything else unserializable is a bug, not a string"""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def write_json_atomic(path, data):
+    """Write JSON via a temp file + rename so a crash never leaves half a file"""
+    tmp_file = path + ".tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, default=json_default)
+    except TypeError:
+        os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, path)
+
+def read_json(path, default):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return copy.deepcopy(default)
+
+class SnapshotBackend:
+    """Whole app state in one data.json, rewritten on every write"""
+
+    def __init__(self, path="data.json"):
+        self.path = path
+        # load()'s defaults, the base for a keyed write to a collection not stored yet
+        self.defaults = {}
+
+    def load(self, default):
+        self.defaults = default
+        return read_json(self.path, default)
+
+    def write(self, records):
+        snapshot, tail = split_snapshot(records)
+        # Re-read rather than keep what load() returned: the caller owns
+        # that dict and swaps in-memory types into it
+        data = snapshot if snapshot is not None else read_json(self.path, {})
+        for record in tail:
+            if record["p"] and record["c"] not in data:
+                data[record["c"]] = copy.deepcopy(self.defaults.get(record["c"], {}))
+            journal.apply_record(data, record)
+        write_json_atomic(self.path, data)
+
+    def needs_compaction(self):
+        return False
+
+class JournalBackend(SnapshotBackend):
+    """data.json snapshot plus an append-only data.journal of small changes"""
+
+    def load(self, default):
+        return journal.replay(read_json(self.path, default))
+
+    def write(self, records):
+        snapshot, tail = split_snapshot(records)
+        if snapshot is not None:
+            write_json_atomic(self.path, snapshot)
+            journal.truncate()
+        journal.append_records(tail)
+
+    def needs_compaction(self):
+        return journal.needs_compaction()
+
+def make_backend(mode):
+    """Build the backend for a STORAGE_MODE name"""
+    if mode == "snapshot":
+        return SnapshotBackend()
+    if mode == "journal":
+        return JournalBackend()
+    if mode == "sqlite":
+        from core.sqlite_store import SqliteBackend
+        return SqliteBackend()
+    if mode == "sharded":
+        from core.shard_store import ShardedBackend
+        return ShardedBackend()
+    raise ValueError(f"Unknown storage mode: {mode}")
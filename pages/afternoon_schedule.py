@@ -1,13 +1,22 @@
 import streamlit as st
 import datetime
 from core.date_utils import get_today_date
-from core.data_handler import save_data
+from core.data_handler import editable, save_data
+from core.classroom_index import record_completion
 
-def draw():
-    st.title("🕑 Afternoon Schedule")
-    today_date = get_today_date()
+SUBJECTS = [
+    "Database System",
+    "Operating Systems",
+    "Compiler Design",
+    "Computer Networks",
+    "Cloud Architecture Design"
+]
 
-    # 1. Morning Exercise
+# Each card is a fragment: ticking a box reruns (and saves) only its card,
+# not the other cards or the classroom grids
+
+@st.fragment
+def exercise_card(today_date):
     exc_col1, exc_col2 = st.columns([6, 1])
     with exc_col1:
         st.markdown(
@@ -27,10 +36,12 @@ def draw():
         checked = st.checkbox("✔️ Completed", key=f"morning_exercise_check_{today_date}",
                               value=st.session_state.morning_exercise_records.get(today_date, False))
         if st.session_state.morning_exercise_records.get(today_date, False) != checked:
-            st.session_state.morning_exercise_records[today_date] = checked
-            save_data()
+            editable("morning_exercise_records")[today_date] = checked
+            save_data("morning_exercise_records", today_date)
 
-    # 2. Jawline Routine: with lips and eyes bullet points
+@st.fragment
+def jawline_card(today_date):
+    # Jawline Routine: with lips and eyes bullet points
     jaw_col1, jaw_col2 = st.columns([6,1])
     with jaw_col1:
         st.markdown("""
@@ -60,10 +71,11 @@ def draw():
         checked = st.checkbox("✔️ Completed", key=f"jawline_check_{today_date}",
                               value=st.session_state.jawline_records.get(today_date, False))
         if st.session_state.jawline_records.get(today_date, False) != checked:
-            st.session_state.jawline_records[today_date] = checked
-            save_data()
+            editable("jawline_records")[today_date] = checked
+            save_data("jawline_records", today_date)
 
-    # 3. Duolingo
+@st.fragment
+def duolingo_card(today_date):
     st.markdown("""
     <div style='background-color:#e6ffe6;color:#000000;padding:20px;border-radius:10px;margin-top:25px;'>
         <h4>📘 DUOLINGO</h4>
@@ -73,10 +85,12 @@ def draw():
                                   key=f"duolingo_afternoon_{today_date}",
                                   value=st.session_state.duolingo_records.get(today_date, False))
     if st.session_state.duolingo_records.get(today_date, False) != duolingo_checked:
-        st.session_state.duolingo_records[today_date] = duolingo_checked
-        save_data()
+        editable("duolingo_records")[today_date] = duolingo_checked
+        save_data("duolingo_records", today_date)
 
-    # 4. New Water Count 💧 (AfC,L,E,D)
+@st.fragment
+def water_card(today_date):
+    # New Water Count 💧 (AfC,L,E,D)
     st.markdown("""
     <div style='background-color:#ccf5ff;color:#000000;padding:20px;border-radius:10px;margin-top:25px;'>
         <h4>💧 Water Count (AfC,L,E,D):</h4>
@@ -87,8 +101,8 @@ def draw():
                                    key=f"water_count_input_{today_date}",
                                    value=st.session_state.water_counts.get(today_date, 0))
     if st.session_state.water_counts.get(today_date, None) != water_count:
-        st.session_state.water_counts[today_date] = water_count
-        save_data()
+        editable("water_counts")[today_date] = water_count
+        save_data("water_counts", today_date)
 
     checklist_labels = ["AfC", "L", "E", "D"]
     cols = st.columns(4)
@@ -98,8 +112,8 @@ def draw():
         checked = cols[i].checkbox(checklist_labels[i], key=f"water_check_{today_date}_{i}", value=checklist_states[i])
         new_checklist_states.append(checked)
     if new_checklist_states != checklist_states:
-        st.session_state.water_checklists[today_date] = new_checklist_states
-        save_data()
+        editable("water_checklists")[today_date] = new_checklist_states
+        save_data("water_checklists", today_date)
 
     auto_checked = (water_count == 3 or water_count == 4)
     if auto_checked:
@@ -108,56 +122,66 @@ def draw():
     big_check = small_checks_count >= 3
     prev_big_check = st.session_state.water_main_checklist.get(today_date, False)
     if prev_big_check != big_check:
-        st.session_state.water_main_checklist[today_date] = big_check
-        save_data()
+        editable("water_main_checklist")[today_date] = big_check
+        save_data("water_main_checklist", today_date)
     st.checkbox("✔️ Big Water Checklist", value=big_check, key=f"big_water_check_{today_date}", disabled=True)
 
-    # 5. Classroom Studies with subject selection and 5 grids
+@st.fragment
+def classroom_card():
+    # Classroom Studies with subject selection and 5 grids
     st.markdown("""<hr style='margin-top:30px;margin-bottom:10px;border:1px solid #ccc;'>""", unsafe_allow_html=True)
     st.markdown("<h3>📚 Classroom Studies</h3>", unsafe_allow_html=True)
-    subjects = [
-        "Database System",
-        "Operating Systems",
-        "Compiler Design",
-        "Computer Networks",
-        "Cloud Architecture Design"
-    ]
     with st.form(key="classroom_studies_form_afternoon"):
         task = st.text_input("Enter your study topic:")
         date = st.date_input("Select the date for this task", value=datetime.date.today())
-        selected_subject = st.selectbox("Select Subject", options=subjects)
+        selected_subject = st.selectbox("Select Subject", options=SUBJECTS)
         submitted = st.form_submit_button("Submit Study Task")
         if submitted:
             if task and selected_subject:
-                st.session_state.classroom_tasks[selected_subject].append(
+                editable("classroom_tasks")[selected_subject].append(
                     {"task": task.strip(), "date": str(date)}
                 )
-                save_data()
+                save_data("classroom_tasks", selected_subject)
             else:
                 st.warning("Please enter a task and select subject before submitting.")
 
     st.markdown("#### Pending Tasks (by subject)")
     grids = st.columns(5)
-    for grid_idx, subject in enumerate(subjects):
+    for grid_idx, subject in enumerate(SUBJECTS):
         with grids[grid_idx]:
-            st.markdown(f"<div style='background-color:#F6F8FA;padding:7px;border-radius:8px;font-weight:bold;text-align:center;'>{subject}</div>", unsafe_allow_html=True)
-            to_remove = []
-            for idx, task_item in enumerate(sorted(
-                st.session_state.classroom_tasks[subject], key=lambda x: x["date"]
-            )):
-                key_done = f"classroom_done_{subject}_{idx}"
-                if st.checkbox("Done", key=key_done):
-                    date = task_item["date"]
-                    if date not in st.session_state.completed_classroom_tasks[subject]:
-                        st.session_state.completed_classroom_tasks[subject][date] = []
-                    st.session_state.completed_classroom_tasks[subject][date].append(task_item["task"])
-                    to_remove.append(idx)
-                st.markdown(f"**{task_item['task']}**")
-                st.write(f"📅 {task_item['date']}")
-            if to_remove:
-                for idx in sorted(to_remove, reverse=True):
-                    st.session_state.classroom_tasks[subject].pop(idx)
-                save_data()
-                st.experimental_rerun()
-            if not st.session_state.classroom_tasks[subject]:
-                st.info("No pending tasks.")
+            subject_grid(subject)
+
+def complete_task(subject, task_item, key_done):
+    """on_change of a Done box: move the task to the completed ones"""
+    # The next task takes over this key; it must not start out ticked
+    st.session_state[key_done] = False
+    if task_item not in st.session_state.classroom_tasks[subject]:
+        return
+    record_completion(subject, task_item["date"], task_item["task"])
+    editable("classroom_tasks")[subject].remove(task_item)
+    save_data("classroom_tasks", subject)
+    save_data("completed_classroom_tasks", (subject, task_item["date"]))
+
+@st.fragment
+def subject_grid(subject):
+    """One subject's pending tasks; ticking Done reruns only this grid"""
+    st.markdown(f"<div style='background-color:#F6F8FA;padding:7px;border-radius:8px;font-weight:bold;text-align:center;'>{subject}</div>", unsafe_allow_html=True)
+    for idx, task_item in enumerate(sorted(
+        st.session_state.classroom_tasks[subject], key=lambda x: x["date"]
+    )):
+        key_done = f"classroom_done_{subject}_{idx}"
+        # Completed in the callback, before the grid redraws without it
+        st.checkbox("Done", key=key_done, on_change=complete_task, args=(subject, task_item, key_done))
+        st.markdown(f"**{task_item['task']}**")
+        st.write(f"📅 {task_item['date']}")
+    if not st.session_state.classroom_tasks[subject]:
+        st.info("No pending tasks.")
+
+def draw():
+    st.title("🕑 Afternoon Schedule")
+    today_date = get_today_date()
+    exercise_card(today_date)
+    jawline_card(today_date)
+    duolingo_card(today_date)
+    water_card(today_date)
+    classroom_card()
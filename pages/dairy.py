@@ -1,6 +1,6 @@
 import streamlit as st
 from core.date_utils import get_today_date
-from core.data_handler import save_data
+from core.data_handler import editable, save_data
 
 def draw():
     st.title("📖 Dairy Entry")
@@ -8,6 +8,6 @@ def draw():
     old_val = st.session_state.dairy_records.get(today_date, "")
     new_val = st.text_area("Your Dairy for Today:", value=old_val, height=350)
     if st.button("Save Dairy Entry"):
-        st.session_state.dairy_records[today_date] = new_val
-        save_data()
+        editable("dairy_records")[today_date] = new_val
+        save_data("dairy_records", today_date)
         st.success("Your dairy entry has been saved!")
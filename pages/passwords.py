@@ -1,5 +1,5 @@
 import streamlit as st
-from core.data_handler import save_data
+from core.data_handler import editable, save_data
 
 def draw():
     st.title("🔒 Password Vault")
@@ -11,12 +11,12 @@ def draw():
         dest_folder = st.selectbox("Push to folder:", options=folders)
         submitted = st.form_submit_button("Push to Folder (Green Button)")
         if submitted and username and password and content and dest_folder:
-            st.session_state.passwords[dest_folder].append({
+            editable("passwords")[dest_folder].append({
                 "username": username,
                 "password": password,
                 "content": content
             })
-            save_data()
+            save_data("passwords", dest_folder)
             st.success(f"Saved to {dest_folder}.")
     pw_cols = st.columns(4)
     for idx, folder in enumerate(folders):
@@ -1,29 +1,40 @@
 import streamlit as st
 import calendar
 import datetime
-from core.calendar_helpers import (
-    render_activity_calendar, render_classroom_calendar, render_water_calendar
-)
+from core.calendar_helpers import render_calendar
+from core.classroom_index import has_completion, topics_on
+from core.stats import render_stats_panel
+from core.heatmap import render_year_heatmap
 
 def draw():
     st.title("🗃️ Stored Data")
     today = datetime.date.today()
     year, month = today.year, today.month
 
+    render_stats_panel()
+
+    view = st.radio("View", ["This Month", "Year Heatmap"], horizontal=True, key="stored_data_view")
+    if view == "Year Heatmap":
+        years = sorted({y for name in ("duolingo_records", "morning_exercise_records", "jawline_records")
+                        for y in st.session_state[name].years} | {year}, reverse=True)
+        heatmap_year = st.selectbox("Year", years, key="heatmap_year")
+        render_year_heatmap(heatmap_year)
+        return
+
     # Division 1: Duolingo Calendar
-    render_activity_calendar(st.session_state.duolingo_records, year, month, "Division 1: Duolingo Activity Calendar")
+    render_calendar("duolingo_records", year, month, "Division 1: Duolingo Activity Calendar")
     st.info("A green tick means Duolingo checklist was marked as completed for that day.")
 
     # Division 2: Morning Exercise Calendar
-    render_activity_calendar(st.session_state.morning_exercise_records, year, month, "Division 2: Morning Exercise Calendar")
+    render_calendar("morning_exercise_records", year, month, "Division 2: Morning Exercise Calendar")
     st.info("A green tick means Morning Exercise was marked completed.")
 
     # Division 3: Jawline Routine Calendar
-    render_activity_calendar(st.session_state.jawline_records, year, month, "Division 3: Jawline Routine Calendar")
+    render_calendar("jawline_records", year, month, "Division 3: Jawline Routine Calendar")
     st.info("A green tick means Jawline Routine was marked completed.")
 
     # Division 4: Classroom Studies Calendar
-    render_classroom_calendar(st.session_state.completed_classroom_tasks, year, month, "Division 4: Classroom Studies Calendar")
+    render_calendar("completed_classroom_tasks", year, month, "Division 4: Classroom Studies Calendar")
     st.info("Click a ticked day (green tick) to view topics completed.")
 
     # Calendar with clickable days to show completed classroom studies by subject
@@ -42,20 +53,13 @@ def draw():
                     row_cols[idx].markdown(" ")
                 else:
                     day_date = datetime.date(year, month, day).isoformat()
-                    found = False
-                    for subject in st.session_state.completed_classroom_tasks:
-                        if day_date in st.session_state.completed_classroom_tasks[subject]:
-                            found = True
-                            break
+                    found = has_completion(day_date)
                     label = f"✅ {day}" if found else str(day)
                     if row_cols[idx].button(label, key=f"classroomcal_{day_date}"):
                         class_date_clicked = day_date
     if class_date_clicked:
-        msgs = []
-        for subject in st.session_state.completed_classroom_tasks:
-            topics = st.session_state.completed_classroom_tasks[subject].get(class_date_clicked, [])
-            if topics:
-                msgs.append(f"**{subject}:** " + ", ".join(topics))
+        msgs = [f"**{subject}:** " + ", ".join(topics)
+                for subject, topics in topics_on(class_date_clicked).items()]
         if msgs:
             st.success("\n".join(msgs))
         else:
@@ -71,7 +75,7 @@ def draw():
         st.warning(f"Dairy was not written on {selected_dairy_date}.")
 
     # Division 6: Water Count Calendar (new)
-    render_water_calendar(st.session_state.water_main_checklist, year, month, "Division 6: Water Count Calendar")
+    render_calendar("water_main_checklist", year, month, "Division 6: Water Count Calendar")
     st.info("A green tick means Big Water Checklist was marked completed for that day.")
 
     st.markdown(f"""<div style='background-color:#ffe6e6;padding:15px;border-radius:10px;margin-top:15px;margin-bottom:10px;'>
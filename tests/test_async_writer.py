@@ -0,0 +1,81 @@
+import threading
+import pytest
+from core.async_writer import CoalescingWriter
+
+class Disk:
+    """flush_fn that records batches and can be told to fail"""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, records):
+        self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.batches.append(records)
+
+@pytest.fixture
+def make_writer():
+    writers = []
+    def make(disk, window=0.01):
+        writer = CoalescingWriter(disk, window=window)
+        writers.append(writer)
+        return writer
+    yield make
+    for writer in writers:
+        writer.close()
+
+def test_burst_is_merged_newest_first_and_parents_replace_children(make_writer):
+    disk = Disk()
+    writer = make_writer(disk, window=0.2)
+    writer.submit(("passwords", ("Folder 1",)), {"v": 1})
+    writer.submit(("passwords", ("Folder 1",)), {"v": 2})
+    writer.submit(("water_counts", ("2025-08-01",)), {"v": 3})
+    writer.submit(("water_counts", ()), {"v": 4})
+    assert writer.wait(5)
+    assert disk.batches == [[{"v": 2}, {"v": 4}]]
+
+def test_snapshot_replaces_everything_queued(make_writer):
+    disk = Disk()
+    writer = make_writer(disk, window=0.2)
+    writer.submit(("passwords", ("Folder 1",)), {"v": 1})
+    writer.submit(None, {"snapshot": {}})
+    assert writer.wait(5)
+    assert disk.batches == [[{"snapshot": {}}]]
+
+def test_failed_flush_is_retried_with_later_changes(make_writer):
+    disk = Disk(failures=2)
+    writer = make_writer(disk)
+    writer.submit(("passwords", ("Folder 1",)), {"v": 1})
+    with pytest.raises(OSError):
+        writer.wait(5)
+    writer.submit(("passwords", ("Folder 2",)), {"v": 2})
+    while True:
+        try:
+            assert writer.wait(5)
+            break
+        except OSError:
+            continue
+    assert [record for batch in disk.batches for record in batch] == [{"v": 1}, {"v": 2}]
+
+def test_wait_times_out_while_a_flush_is_running(make_writer):
+    disk = Disk()
+    disk.gate.clear()
+    writer = make_writer(disk)
+    writer.submit(("passwords", ()), {"v": 1})
+    assert writer.wait(0.1) is False
+    disk.gate.set()
+    assert writer.wait(5)
+
+def test_close_flushes_what_is_queued():
+    disk = Disk()
+    writer = CoalescingWriter(disk, window=0.5)
+    writer.submit(("passwords", ()), {"v": 1})
+    writer.close()
+    assert disk.batches == [[{"v": 1}]]
+    with pytest.raises(RuntimeError):
+        writer.submit(("passwords", ()), {"v": 2})
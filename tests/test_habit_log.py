@@ -0,0 +1,52 @@
+import random
+import datetime
+import pytest
+from core.habit_log import HabitLog
+
+START = datetime.date(2023, 11, 1)
+
+def random_days(rnd):
+    """A set of completed dates across a year boundary, with runs of different lengths"""
+    days = set()
+    day = START
+    while day < START + datetime.timedelta(days=800):
+        if rnd.random() < rnd.choice((0.2, 0.6, 0.9)):
+            days.update(day + datetime.timedelta(days=i) for i in range(rnd.randint(1, 20)))
+        day += datetime.timedelta(days=rnd.randint(1, 25))
+    return days
+
+def brute_current(days, today):
+    day = today if today in days else today - datetime.timedelta(days=1)
+    streak = 0
+    while day in days:
+        streak += 1
+        day -= datetime.timedelta(days=1)
+    return streak
+
+def brute_longest(days):
+    return max((brute_current(days, day) for day in days), default=0)
+
+@pytest.mark.parametrize("seed", range(200))
+def test_streaks_and_counts_match_day_by_day(seed):
+    rnd = random.Random(seed)
+    days = random_days(rnd)
+    log = HabitLog()
+    for day in days:
+        log[day.isoformat()] = True
+
+    assert log.longest_streak() == brute_longest(days)
+    for _ in range(10):
+        today = START + datetime.timedelta(days=rnd.randint(-5, 830))
+        assert log.current_streak(today) == brute_current(days, today)
+        start = START + datetime.timedelta(days=rnd.randint(-40, 830))
+        end = start + datetime.timedelta(days=rnd.randint(-3, 400))
+        assert log.count_between(start, end) == sum(start <= day <= end for day in days)
+
+    assert HabitLog.from_stored(log.to_json()).to_dict() == log.to_dict()
+    assert sorted(log) == sorted(day.isoformat() for day in days)
+
+def test_legacy_days_apply_on_top_of_the_bitmap():
+    log = HabitLog()
+    log["2025-01-01"] = True
+    stored = dict(log.to_json(), **{"2025-01-01": False, "2025-01-02": True})
+    assert HabitLog.from_stored(stored).to_dict() == {"2025-01-02": True}
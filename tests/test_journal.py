@@ -0,0 +1,43 @@
+import os
+import pytest
+from core import journal
+from core.storage import JournalBackend
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    # data.json and data.journal live in the working directory
+    monkeypatch.chdir(tmp_path)
+    journal.truncate()
+
+def record(day, value):
+    return {"c": "water_counts", "p": [day], "v": value}
+
+@pytest.mark.parametrize("torn", ['{"c": "water_counts", "p": ["2025-08-0', '{"c": "water_counts", "p": ["2025-08-02"], "v": 2}'])
+def test_append_after_a_torn_tail_keeps_the_next_record(torn):
+    journal.append_records([record("2025-08-01", 1)])
+    with open(journal.JOURNAL_FILE, "a") as f:
+        f.write(torn)
+    journal.replay({})
+    journal.append_records([record("2025-08-03", 3)])
+
+    days = journal.replay({})["water_counts"]
+    assert days["2025-08-01"] == 1 and days["2025-08-03"] == 3
+    # A record torn only before its newline is whole and kept
+    assert ("2025-08-02" in days) == torn.endswith("}")
+
+def test_replay_applies_values_and_deletes_in_order():
+    journal.append_records([record("2025-08-01", 1), record("2025-08-02", 2),
+                            {"c": "water_counts", "p": ["2025-08-01"], "d": 1}, record("2025-08-02", 4)])
+    assert journal.replay({"water_counts": {"2025-07-31": 0}}) == {"water_counts": {"2025-07-31": 0, "2025-08-02": 4}}
+
+def test_compaction_folds_the_journal_into_the_snapshot():
+    backend = JournalBackend()
+    backend.write([{"snapshot": {"water_counts": {}}}])
+    backend.write([record(f"2025-{i // 28 + 1:02d}-{i % 28 + 1:02d}", i % 5) for i in range(journal.COMPACT_AFTER)])
+    assert backend.needs_compaction()
+    expected = backend.load({})
+
+    backend.write([{"snapshot": expected}])
+    assert not backend.needs_compaction()
+    assert not os.path.exists(journal.JOURNAL_FILE)
+    assert JournalBackend().load({}) == expected
@@ -0,0 +1,60 @@
+import random
+import datetime
+import pytest
+from core.scheduling.entries import ScheduleEntry
+from core.scheduling.placement import find_placements
+
+TODAY = datetime.date(2025, 8, 1)
+
+def random_plan(rnd):
+    """Breaks and topics with overlapping, multi-range spans around TODAY"""
+    plan = []
+    for i in range(rnd.randint(0, 15)):
+        ranges = []
+        day = TODAY.toordinal() + rnd.randint(-20, 60)
+        for _ in range(rnd.choice((1, 1, 2, 3))):
+            start = day + rnd.randint(0, 5)
+            end = start + rnd.randint(0, 8)
+            ranges.append((start, end))
+            day = end + 2
+        days = sum(end - start + 1 for start, end in ranges)
+        if rnd.random() < 0.3:
+            plan.append(ScheduleEntry("Break", f"Exam {i}", days, ranges, ""))
+        else:
+            plan.append(ScheduleEntry("DSA", f"Topic {i}", days, ranges, ""))
+    return plan
+
+def score(plan, start, end):
+    """(splits, displaced) of the window start..end, or None if it hits a break"""
+    breaks = [r for e in plan if e.type == "Break" for r in e.ranges]
+    topics = [r for e in plan if e.type == "DSA" for r in e.ranges]
+    if any(day <= b_end and day >= b_start for b_start, b_end in breaks for day in range(start, end + 1)):
+        return None
+    splits = sum(1 for t_start, t_end in topics if t_start < start and t_end > end)
+    displaced = sum(1 for day in range(start, end + 1)
+                    if any(t_start <= day <= t_end for t_start, t_end in topics))
+    return splits, displaced
+
+def brute_force_best(plan, days, not_before):
+    last_day = max([not_before] + [end for e in plan for _, end in e.ranges])
+    best = None
+    for start in range(not_before, last_day + 2):
+        scored = score(plan, start, start + days - 1)
+        if scored is not None and (best is None or (*scored, start) < best):
+            best = (*scored, start)
+    return best
+
+@pytest.mark.parametrize("seed", range(500))
+def test_best_placement_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    plan = random_plan(rnd)
+    days = rnd.randint(1, 10)
+    not_before = TODAY + datetime.timedelta(rnd.randint(-10, 30))
+    placements = find_placements(plan, days, k=3, not_before=not_before)
+    splits, displaced, start = brute_force_best(plan, days, not_before.toordinal())
+    best = placements[0]
+    assert (best["splits"], best["displaced"], best["start"].toordinal()) == (splits, displaced, start)
+    for placement in placements:
+        first, last = placement["start"].toordinal(), placement["end"].toordinal()
+        assert last - first + 1 == days
+        assert score(plan, first, last) == (placement["splits"], placement["displaced"])
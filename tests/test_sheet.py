@@ -0,0 +1,68 @@
+import random
+import datetime
+import pytest
+from core.scheduling import sheet
+from core.scheduling.entries import ScheduleEntry, rows_from_entries
+
+TODAY = datetime.date(2025, 8, 1)
+
+def random_sheet(rnd, n):
+    rows = []
+    day = TODAY + datetime.timedelta(rnd.randint(-30, 30))
+    for i in range(n):
+        length = rnd.randint(1, 12)
+        start = day + datetime.timedelta(rnd.randint(-5, 8))
+        end = start + datetime.timedelta(length - 1)
+        ranges = [(start.toordinal(), end.toordinal())]
+        kind = rnd.random()
+        if kind < 0.25:
+            rows.append(ScheduleEntry("Break", f"Exam {i}", length, ranges, "x"))
+        elif kind < 0.3:
+            rows.append(ScheduleEntry("DSA", rnd.choice(["CAT-3", "gravitas fest", "#P hack"]), length, ranges, ""))
+        else:
+            rows.append(ScheduleEntry("DSA", f"Topic {i}", rnd.randint(1, 12), ranges, "n"))
+        day = end + datetime.timedelta(1)
+    return rows
+
+def without_uids(entries):
+    # A new topic gets a fresh random UID on each path
+    return [{k: v for k, v in row.items() if k != "UID"} for row in rows_from_entries(entries)]
+
+def random_edit(rnd, plan):
+    """(incremental result, full rebuild result) of one random page edit"""
+    op = rnd.random()
+    if op < 0.4 and plan:
+        i = rnd.randrange(len(plan))
+        return (sheet.delete_entry(plan, i, today=TODAY),
+                sheet.rebuild_schedule_with_new(plan, delete_row_idx=i, today=TODAY))
+    start = TODAY + datetime.timedelta(rnd.randint(-20, 200))
+    if op < 0.75:
+        # The green bar's default range is today..today+1
+        if rnd.random() < 0.3:
+            start = TODAY
+        new = {"Type": "DSA", "Topic": "New", "Start": start,
+               "End": start + datetime.timedelta(rnd.randint(0, 10)), "Notes": "m"}
+        return (sheet.insert_entry(plan, new, today=TODAY),
+                sheet.rebuild_schedule_with_new(plan, new_entry=new, today=TODAY))
+    end = start + datetime.timedelta(rnd.randint(0, 6))
+    fun = ScheduleEntry("Break", "Fun", (end - start).days + 1, [(start.toordinal(), end.toordinal())], "f")
+    return (sheet.insert_break(plan, fun, today=TODAY),
+            sheet.rebuild_schedule_with_new(plan + [fun], today=TODAY))
+
+@pytest.mark.parametrize("seed", range(300))
+def test_incremental_edits_match_full_rebuild(seed):
+    rnd = random.Random(seed)
+    plan = sheet.rebuild_schedule_with_new(random_sheet(rnd, rnd.randint(0, 25)), today=TODAY)
+    for _ in range(10):
+        before = rows_from_entries(plan)
+        incremental, full = random_edit(rnd, plan)
+        assert without_uids(incremental) == without_uids(full)
+        assert rows_from_entries(plan) == before
+        plan = full
+
+def test_deleting_a_topic_added_before_the_first_break():
+    exam = ScheduleEntry("Break", "Exam", 2, [(TODAY.toordinal() + 10, TODAY.toordinal() + 11)], "")
+    new = {"Type": "DSA", "Topic": "Arrays", "Start": TODAY, "End": TODAY + datetime.timedelta(1), "Notes": ""}
+    plan = sheet.insert_entry([exam], new, today=TODAY)
+    assert [entry.topic for entry in plan] == ["Arrays", "Exam"]
+    assert [entry.topic for entry in sheet.delete_entry(plan, 0, today=TODAY)] == ["Exam"]
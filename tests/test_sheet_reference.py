@@ -0,0 +1,216 @@
+"""The packed rebuild against the day-stepping code it replaced.
+
+reference_rebuild is rebuild_schedule_with_new as it was nested inside
+pages/dsa_sheet.py draw() (with find_next_available stepping one day at a
+time), lifted out with today and the keywords as parameters.
+"""
+import random
+import datetime
+from copy import deepcopy
+import pytest
+from core.scheduling import sheet
+from core.scheduling.entries import entries_from_rows, rows_from_entries
+
+TODAY = datetime.date(2025, 8, 1)
+FIXED_KEYWORDS = ["CAT", "Gravitas"]
+
+def parse_date(date_str):
+    return datetime.datetime.strptime(date_str, "%d/%m/%y").date()
+
+def format_date(date):
+    return date.strftime("%d/%m/%y")
+
+def format_date_range(start, end):
+    if start == end:
+        return format_date(start)
+    return f"{format_date(start)} – {format_date(end)}"
+
+def daterange(start_date, end_date):
+    for n in range((end_date - start_date).days + 1):
+        yield start_date + datetime.timedelta(n)
+
+def is_break(topic_row):
+    typ = topic_row.get('Type', '')
+    topic = topic_row.get('Topic', '')
+    if typ.lower() == "break":
+        return True
+    if any(kw.lower() in topic.lower() for kw in FIXED_KEYWORDS):
+        return True
+    if topic.startswith("#P"):
+        return True
+    return False
+
+def parse_row_range(row):
+    periods = []
+    for rng in row['Date Range'].split(','):
+        rng = rng.strip()
+        if "–" in rng:
+            part = rng.split("–")
+            periods.append((parse_date(part[0].strip()), parse_date(part[1].strip())))
+        else:
+            dt = parse_date(rng.strip())
+            periods.append((dt, dt))
+    return periods
+
+def get_break_periods(rows):
+    periods = []
+    for row in rows:
+        if is_break(row):
+            periods += parse_row_range(row)
+    return periods
+
+def find_next_available(start_date, days, break_periods):
+    current = start_date
+    assigned = 0
+    periods = []
+    while assigned < days:
+        in_break = False
+        for bstart, bend in break_periods:
+            if bstart <= current <= bend:
+                current = bend + datetime.timedelta(days=1)
+                in_break = True
+                break
+        if not in_break:
+            days_here = 1
+            while (
+                assigned + days_here < days
+                and not any(
+                    bstart <= current + datetime.timedelta(days=days_here) <= bend
+                    for bstart, bend in break_periods
+                )
+            ):
+                days_here += 1
+            periods.append((current, current + datetime.timedelta(days=days_here - 1)))
+            assigned += days_here
+            current = current + datetime.timedelta(days=days_here)
+    return periods
+
+def new_row(new_entry):
+    return {
+        "Type": new_entry['Type'] if new_entry.get('Type') else "DSA",
+        "Topic": new_entry['Topic'],
+        "Days": (new_entry['End'] - new_entry['Start']).days + 1,
+        "Date Range": format_date_range(new_entry['Start'], new_entry['End']),
+        "Notes": new_entry.get('Notes', '–')
+    }
+
+def reference_rebuild(rows, new_entry=None, delete_row_idx=None, today=TODAY):
+    scratch = deepcopy(rows)
+    if delete_row_idx is not None and delete_row_idx < len(scratch):
+        del scratch[delete_row_idx]
+
+    breaks = []
+    moving_dsas = []
+    for row in scratch:
+        if is_break(row):
+            breaks.append(row)
+        else:
+            moving_dsas.append(row)
+
+    if new_entry is not None:
+        packed = []
+        placed = False
+        for row in moving_dsas:
+            all_days = []
+            for rng in parse_row_range(row):
+                all_days += list(daterange(rng[0], rng[1]))
+            new_days = list(daterange(new_entry['Start'], new_entry['End']))
+            if not set(all_days) & set(new_days):
+                packed.append(row)
+                continue
+            days_before = [d for d in all_days if d < new_entry['Start']]
+            days_after = [d for d in all_days if d > new_entry['End']]
+            if days_before:
+                part1 = deepcopy(row)
+                part1['Topic'] = f"{row['Topic']} (Part 1)"
+                part1['Days'] = len(days_before)
+                part1['Date Range'] = format_date_range(days_before[0], days_before[-1])
+                packed.append(part1)
+            if not placed:
+                packed.append(new_row(new_entry))
+                placed = True
+            if days_after:
+                part2 = deepcopy(row)
+                part2['Topic'] = f"{row['Topic']} (continued)"
+                part2['Days'] = len(days_after)
+                part2['Date Range'] = format_date_range(days_after[0], days_after[-1])
+                packed.append(part2)
+        if not placed:
+            packed.append(new_row(new_entry))
+        moving_dsas = packed
+
+    dsa_tasks = [{'Type': row.get('Type', "DSA"), 'Topic': row['Topic'], 'Days': row['Days'],
+                  'Notes': row.get('Notes', "")} for row in moving_dsas]
+
+    ordered_breaks = sorted(
+        breaks,
+        key=lambda r: parse_row_range(r)[0][0] if len(parse_row_range(r)) else datetime.date(2099, 1, 1)
+    )
+    first_date = min(
+        [row for row in ordered_breaks if parse_row_range(row)],
+        key=lambda r: parse_row_range(r)[0][0]
+    ) if ordered_breaks else None
+    earliest = parse_row_range(first_date)[0][0] if first_date else today
+    current_date = earliest if new_entry is None else min(new_entry.get('Start', earliest), earliest)
+    filled = []
+    break_periods = get_break_periods(ordered_breaks)
+    for task in dsa_tasks:
+        avail_periods = find_next_available(current_date, task['Days'], break_periods)
+        filled.append({
+            "Type": task['Type'],
+            "Topic": task['Topic'],
+            "Days": task['Days'],
+            "Date Range": ", ".join(format_date_range(a, b) for a, b in avail_periods),
+            "Notes": task['Notes'],
+        })
+        current_date = avail_periods[-1][1] + datetime.timedelta(days=1)
+    all_rows = sorted(
+        filled + ordered_breaks,
+        key=lambda r: parse_row_range(r)[0][0] if len(parse_row_range(r)) else datetime.date(2099, 1, 1)
+    )
+    for idx, row in enumerate(all_rows):
+        row["#"] = idx + 1
+    return all_rows
+
+def random_rows(rnd):
+    rows = []
+    day = TODAY + datetime.timedelta(rnd.randint(-30, 30))
+    for i in range(rnd.randint(0, 20)):
+        ranges = []
+        for _ in range(rnd.choice((1, 1, 1, 2, 3))):
+            start = day + datetime.timedelta(rnd.randint(0, 6))
+            end = start + datetime.timedelta(rnd.randint(0, 9))
+            ranges.append((start, end))
+            day = end + datetime.timedelta(1)
+        days = sum((end - start).days + 1 for start, end in ranges)
+        kind = rnd.random()
+        if kind < 0.25:
+            typ, topic = "Break", f"Exam {i}"
+        elif kind < 0.32:
+            typ, topic = "DSA", rnd.choice(["CAT-3", "gravitas fest", "#P hack"])
+        else:
+            typ, topic = "DSA", f"Topic {i}"
+        rows.append({"Type": typ, "Topic": topic, "Days": days,
+                     "Date Range": ", ".join(format_date_range(s, e) for s, e in ranges), "Notes": "n"})
+    rnd.shuffle(rows)
+    return rows
+
+def comparable(rows):
+    return [{k: v for k, v in row.items() if k != "UID"} for row in rows]
+
+@pytest.mark.parametrize("seed", range(1000))
+def test_rebuild_matches_day_stepping_reference(seed):
+    rnd = random.Random(seed)
+    rows = random_rows(rnd)
+    new_entry = delete_row_idx = None
+    op = rnd.random()
+    if op < 0.4:
+        start = TODAY + datetime.timedelta(rnd.randint(-40, 150))
+        new_entry = {"Type": "DSA", "Topic": "New", "Start": start,
+                     "End": start + datetime.timedelta(rnd.randint(0, 10)), "Notes": "m"}
+    elif op < 0.7 and rows:
+        delete_row_idx = rnd.randrange(len(rows) + 1)
+    expected = reference_rebuild(rows, new_entry, delete_row_idx)
+    got = sheet.rebuild_schedule_with_new(entries_from_rows(rows), new_entry=new_entry,
+                                          delete_row_idx=delete_row_idx, today=TODAY)
+    assert comparable(rows_from_entries(got)) == expected
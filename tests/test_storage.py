@@ -0,0 +1,48 @@
+import copy
+import json
+import pytest
+from core import data_handler
+from core.data_handler import DEFAULT_DATA, DEFAULT_DSA_SCHEDULE
+from core.scheduling.entries import rows_from_entries
+from core.storage import make_backend
+
+@pytest.fixture(autouse=True)
+def fresh_install(tmp_path, monkeypatch):
+    # Every backend keeps its files relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+@pytest.mark.parametrize("mode", ["snapshot", "journal", "sqlite", "sharded"])
+def test_keyed_save_on_fresh_install_reloads_every_default_key(mode):
+    backend = make_backend(mode)
+    backend.load(DEFAULT_DATA)
+    backend.write([{"c": "passwords", "p": ["Folder 1"], "v": [{"site": "mail", "password": "x"}]},
+                   {"c": "classroom_tasks", "p": ["Compiler Design"], "v": [{"task": "LR(1)", "date": "2025-08-01"}]}])
+
+    data = make_backend(mode).load(DEFAULT_DATA)
+    assert data["passwords"] == dict(copy.deepcopy(DEFAULT_DATA["passwords"]),
+                                     **{"Folder 1": [{"site": "mail", "password": "x"}]})
+    assert set(data["classroom_tasks"]) == set(DEFAULT_DATA["classroom_tasks"])
+    assert data["classroom_tasks"]["Compiler Design"] == [{"task": "LR(1)", "date": "2025-08-01"}]
+    assert DEFAULT_DATA["passwords"]["Folder 1"] == []
+
+def load_data(monkeypatch, mode):
+    """data_handler.load_data() as a fresh process would run it, with `mode` storage"""
+    monkeypatch.setattr(data_handler, "STORAGE_MODE", mode)
+    monkeypatch.setattr(data_handler, "_backend", None)
+    monkeypatch.setattr(data_handler, "_history", None)
+    return data_handler.load_data()
+
+@pytest.mark.parametrize("mode", ["snapshot", "journal", "sqlite", "sharded"])
+def test_default_plan_is_stored_once_and_can_be_emptied(monkeypatch, mode):
+    seeded = load_data(monkeypatch, mode)["dsa_schedule"]
+    assert [e.topic for e in seeded] == [row["Topic"] for row in DEFAULT_DSA_SCHEDULE]
+    assert all(e.uid for e in seeded)
+    assert rows_from_entries(load_data(monkeypatch, mode)["dsa_schedule"]) == rows_from_entries(seeded)
+
+    data_handler.get_backend().write([{"c": "dsa_schedule", "p": [], "v": []}])
+    assert load_data(monkeypatch, mode)["dsa_schedule"] == []
+
+def test_legacy_plan_replaces_the_default_plan(monkeypatch):
+    with open(data_handler.LEGACY_DSA_FILE, "w") as f:
+        json.dump(DEFAULT_DSA_SCHEDULE[:2], f)
+    assert [e.topic for e in load_data(monkeypatch, "sharded")["dsa_schedule"]] == ["LinkedList", "Recursion"]